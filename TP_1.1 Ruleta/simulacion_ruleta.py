@@ -1,12 +1,21 @@
+import os
+import sys
+import time
 import random
 import argparse
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.ticker import PercentFormatter
 
-def simular_ruleta(n_tiradas, n_corridas, numero_elegido):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utilidades import perfilado, progresivo
+
+def simular_ruleta(n_tiradas, n_corridas, numero_elegido, perfil=None):
     """
     Simula múltiples corridas de una ruleta y calcula estadísticas
+
+    Si se pasa un Perfilador en `perfil`, se mide el tiempo de generación de
+    tiradas y de cálculo de estadísticas.
     """
     # Configuración de la ruleta (europea: 0-36)
     numeros_ruleta = list(range(37))
@@ -21,8 +30,13 @@ def simular_ruleta(n_tiradas, n_corridas, numero_elegido):
     }
     
     for _ in range(n_corridas):
+        if perfil is not None:
+            perfil.reiniciar_marca()
+
         # Simular tiradas
         tiradas = [random.choice(numeros_ruleta) for _ in range(n_tiradas)]
+        if perfil is not None:
+            perfil.marcar('generacion')
         
         # Calcular estadísticas acumulativas
         fr_acum = []  # Frecuencia relativa acumulada del número elegido
@@ -63,9 +77,25 @@ def simular_ruleta(n_tiradas, n_corridas, numero_elegido):
         resultados['promedios'].append(vp_acum)
         resultados['varianzas'].append(vv_acum)
         resultados['desvios'].append(vd_acum)
+        if perfil is not None:
+            perfil.marcar('estadisticas')
+            perfil.contar('tiradas', n_tiradas)
     
     return resultados
 
+def resumir_lote(n_corridas, n_tiradas, numero_elegido):
+    """
+    Simula un lote de corridas y devuelve su resumen parcial para el modo
+    progresivo (ver utilidades.progresivo).
+    """
+    resultados = simular_ruleta(n_tiradas, n_corridas, numero_elegido)
+    escalares = {
+        'frecuencia_final': [fr[-1] for fr in resultados['frecuencias']],
+        'promedio_final': [vp[-1] for vp in resultados['promedios']],
+    }
+    curvas = {'frecuencias': resultados['frecuencias'], 'promedios': resultados['promedios']}
+    return progresivo.resumen_lote(escalares, curvas)
+
 def graficar_resultados(resultados, n_tiradas, n_corridas, numero_elegido):
     """
     Genera las gráficas solicitadas a partir de los resultados
@@ -174,14 +204,34 @@ def main():
                        help='Número de corridas a simular')
     parser.add_argument('-e', '--numero', type=int, default=0, 
                        help='Número elegido para análisis de frecuencia')
+    progresivo.agregar_argumentos(parser)
+    perfilado.agregar_argumentos(parser)
     
     args = parser.parse_args()
+    perfil = perfilado.crear_perfilador(args, 'TP_1.1 simulacion_ruleta')
+
+    if args.progresivo:
+        # La simulación corre en otro proceso; acá se muestran los resultados parciales
+        vista = progresivo.VistaProgresiva(f'Ruleta - número {args.numero}', args.corridas,
+                                           referencias={'frecuencias': 1/37, 'promedios': sum(range(37))/37})
+        parametros = {'n_tiradas': args.tiradas, 'numero_elegido': args.numero}
+        with perfilado.medir_fase(perfil, 'simulacion_progresiva', excluir_show=True):
+            progresivo.ejecutar_progresivo('ruleta11', 'resumir_lote', parametros, args.corridas, vista,
+                                           intervalo=args.intervalo)
+        perfilado.cerrar_perfilador(perfil, args)
+        return
     
     # Ejecutar simulación
-    resultados = simular_ruleta(args.tiradas, args.corridas, args.numero)
+    inicio = time.perf_counter()
+    resultados = simular_ruleta(args.tiradas, args.corridas, args.numero, perfil=perfil)
+    if perfil is not None:
+        perfil.metricas['tiradas_por_seg'] = perfil.contadores['tiradas'] / (time.perf_counter() - inicio)
     
     # Generar gráficos
-    graficar_resultados(resultados, args.tiradas, args.corridas, args.numero)
+    with perfilado.medir_fase(perfil, 'graficado', excluir_show=True):
+        graficar_resultados(resultados, args.tiradas, args.corridas, args.numero)
+
+    perfilado.cerrar_perfilador(perfil, args)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,127 @@
+import numpy as np
+
+# Parámetros de las estrategias
+APUESTA_BASE = 10
+FIBONACCI = [1, 1, 2, 3, 5, 8, 13, 21, 34]
+REINICIO_PAROLI = 3  # Paroli vuelve a la apuesta base después de tantas victorias seguidas
+
+
+def deducir_tipo_apuesta(seleccion):
+    """Tipo de apuesta que corresponde a una selección, o None si no se puede deducir."""
+    if isinstance(seleccion, int):
+        # 1, 2 y 3 también son docenas o columnas, pero sin --tipo_apuesta se toman como número
+        return 'numero' if 0 <= seleccion <= 36 else None
+    if seleccion in ['rojo', 'negro']:
+        return 'color'
+    if seleccion in ['par', 'impar']:
+        return 'par_impar'
+    if seleccion in ['alto', 'bajo']:
+        return 'alto_bajo'
+    return None
+
+
+def validar_seleccion(tipo_apuesta, seleccion):
+    """Lanza ValueError si la selección no corresponde al tipo de apuesta."""
+    if tipo_apuesta == 'numero' and seleccion is not None and not (isinstance(seleccion, int) and 0 <= seleccion <= 36):
+        raise ValueError("Para apuesta a número, la selección debe estar entre 0 y 36")
+    elif tipo_apuesta == 'color' and seleccion not in ['rojo', 'negro']:
+        raise ValueError("Para apuesta a color, la selección debe ser 'rojo' o 'negro'")
+    elif tipo_apuesta == 'docena' and seleccion not in [1, 2, 3]:
+        raise ValueError("Para apuesta a docena, la selección debe ser 1, 2 o 3")
+    elif tipo_apuesta == 'columna' and seleccion not in [1, 2, 3]:
+        raise ValueError("Para apuesta a columna, la selección debe ser 1, 2 o 3")
+    elif tipo_apuesta == 'par_impar' and seleccion not in ['par', 'impar']:
+        raise ValueError("Para apuesta a par/impar, la selección debe ser 'par' o 'impar'")
+    elif tipo_apuesta == 'alto_bajo' and seleccion not in ['alto', 'bajo']:
+        raise ValueError("Para apuesta a alto/bajo, la selección debe ser 'alto' o 'bajo'")
+
+
+def tabla_apuesta(tipo_apuesta, seleccion):
+    """
+    Devuelve (gana, prob_teorica, pago) para una apuesta, donde gana[n] dice si
+    el número n hace ganar la apuesta.
+    """
+    # Definición de grupos de apuestas
+    rojos = {1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}
+    negros = set(range(1,37)) - rojos
+    
+    docenas = {
+        1: range(1,13),
+        2: range(13,25),
+        3: range(25,37)
+    }
+    
+    columnas = {
+        1: {1,4,7,10,13,16,19,22,25,28,31,34},
+        2: {2,5,8,11,14,17,20,23,26,29,32,35},
+        3: {3,6,9,12,15,18,21,24,27,30,33,36}
+    }
+    
+    # Calcular probabilidad teórica según tipo de apuesta
+    if tipo_apuesta == 'numero':
+        prob_teorica = 1/37
+        pago = 35  # Pago 35:1
+    elif tipo_apuesta == 'color':
+        prob_teorica = 18/37
+        pago = 1  # Pago 1:1
+    elif tipo_apuesta == 'docena' or tipo_apuesta == 'columna':
+        prob_teorica = 12/37
+        pago = 2  # Pago 2:1
+    elif tipo_apuesta == 'par_impar' or tipo_apuesta == 'alto_bajo':
+        prob_teorica = 18/37
+        pago = 1  # Pago 1:1
+    else:
+        prob_teorica = None
+        pago = None
+
+    # Tabla con los números que hacen ganar la apuesta (se arma una sola vez, no en cada tirada)
+    gana = [False] * 37
+    for numero_salido in range(37):
+        if tipo_apuesta == 'numero':
+            gano = (seleccion is not None and numero_salido == seleccion)
+        elif tipo_apuesta == 'color':
+            gano = (seleccion == 'rojo' and numero_salido in rojos) or (seleccion == 'negro' and numero_salido in negros)
+        elif tipo_apuesta == 'docena':
+            gano = (numero_salido in docenas.get(seleccion, set()))
+        elif tipo_apuesta == 'columna':
+            gano = (numero_salido in columnas.get(seleccion, set()))
+        elif tipo_apuesta == 'par_impar':
+            gano = (seleccion == 'par' and numero_salido != 0 and numero_salido % 2 == 0) or \
+                   (seleccion == 'impar' and numero_salido % 2 == 1)
+        elif tipo_apuesta == 'alto_bajo':
+            gano = (seleccion == 'alto' and 18 < numero_salido <= 36) or \
+                   (seleccion == 'bajo' and 1 <= numero_salido <= 18)
+        else:
+            gano = False
+        gana[numero_salido] = gano
+
+    return gana, prob_teorica, pago
+
+
+# Todas las apuestas simples posibles, como (tipo_apuesta, seleccion)
+SELECCIONES = (
+    [('numero', n) for n in range(37)] +
+    [('color', 'rojo'), ('color', 'negro')] +
+    [('docena', d) for d in (1, 2, 3)] +
+    [('columna', c) for c in (1, 2, 3)] +
+    [('par_impar', 'par'), ('par_impar', 'impar')] +
+    [('alto_bajo', 'alto'), ('alto_bajo', 'bajo')]
+)
+
+
+def matriz_pagos(selecciones=SELECCIONES):
+    """
+    Arma la matriz de apuestas x resultados.
+
+    Returns:
+        gana: Matriz booleana (len(selecciones), 37); gana[s, n] dice si la apuesta s gana cuando sale n
+        pagos: Pago de cada apuesta (35, 2 o 1 a 1)
+        probs: Probabilidad teórica de ganar cada apuesta
+    """
+    gana = np.zeros((len(selecciones), 37), dtype=bool)
+    pagos = np.zeros(len(selecciones))
+    probs = np.zeros(len(selecciones))
+    for s, (tipo_apuesta, seleccion) in enumerate(selecciones):
+        fila, probs[s], pagos[s] = tabla_apuesta(tipo_apuesta, seleccion)
+        gana[s] = fila
+    return gana, pagos, probs
@@ -0,0 +1,117 @@
+import os
+import gzip
+import pickle
+
+import numpy as np
+
+# 2: victorias empaquetadas en bits (ver victorias.py)
+# 3: curvas y bandas de las corridas terminadas van en archivos aparte (ver agregar_curvas y agregar_fila_bandas)
+VERSION_CHECKPOINT = 3
+
+# Los checkpoints periódicos solo reescriben el estado chico (random, corrida en
+# curso, valores finales). Lo que crece con cada corrida terminada se agrega al
+# final de archivos aparte, sin volver a serializar lo ya escrito:
+#   <ruta>.curvas         un registro por corrida con sus curvas por tirada
+#   <ruta>.bandas         foto completa del sketch de cuantiles
+#   <ruta>.bandas_diario  filas agregadas al sketch después de la foto
+
+
+def guardar_checkpoint(ruta, datos):
+    """
+    Guarda el estado de una simulación (comprimido) en `ruta`.
+
+    Se escribe primero a un archivo temporal y después se renombra, así un
+    corte en medio de la escritura nunca deja un checkpoint a medias.
+    """
+    temporal = ruta + '.tmp'
+    with gzip.open(temporal, 'wb', compresslevel=3) as f:
+        pickle.dump({'version': VERSION_CHECKPOINT, **datos}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, ruta)
+
+
+def cargar_checkpoint(ruta):
+    """Carga un checkpoint guardado con guardar_checkpoint."""
+    with gzip.open(ruta, 'rb') as f:
+        datos = pickle.load(f)
+    if datos.get('version') != VERSION_CHECKPOINT:
+        raise ValueError(f"El checkpoint {ruta} tiene una versión incompatible ({datos.get('version')})")
+    return datos
+
+
+def ruta_curvas(ruta):
+    """Archivo donde van las curvas por tirada de las corridas terminadas del checkpoint `ruta`."""
+    return ruta + '.curvas'
+
+
+def agregar_curvas(ruta, registro):
+    """Agrega al final del archivo de curvas el registro de una corrida terminada."""
+    with open(ruta_curvas(ruta), 'ab') as f:
+        pickle.dump(registro, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def cargar_curvas(ruta, n_corridas):
+    """
+    Lee los registros de las primeras `n_corridas` corridas del archivo de
+    curvas. Los que sobran (corridas terminadas después del último checkpoint,
+    que se van a volver a simular) se borran del archivo.
+    """
+    registros = []
+    with open(ruta_curvas(ruta), 'r+b') as f:
+        for _ in range(n_corridas):
+            registros.append(pickle.load(f))
+        f.truncate(f.tell())
+    return registros
+
+
+def reescribir_curvas(ruta, registros):
+    """Reemplaza el archivo de curvas por `registros` (vacío para empezar una simulación nueva)."""
+    temporal = ruta_curvas(ruta) + '.tmp'
+    with open(temporal, 'wb') as f:
+        for registro in registros:
+            pickle.dump(registro, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, ruta_curvas(ruta))
+
+
+def guardar_bandas(ruta, bandas):
+    """Escribe una foto completa de las bandas (un SketchCuantiles) y vacía el diario de filas."""
+    temporal = ruta + '.bandas.tmp'
+    with open(temporal, 'wb') as f:
+        pickle.dump(bandas, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, ruta + '.bandas')
+    open(ruta + '.bandas_diario', 'wb').close()
+
+
+def agregar_fila_bandas(ruta, indice, fila):
+    """Anota en el diario la fila número `indice` que se acaba de agregar a las bandas."""
+    with open(ruta + '.bandas_diario', 'ab') as f:
+        pickle.dump((indice, np.asarray(fila, dtype=np.float64)), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def compactar_bandas(ruta, bandas):
+    """
+    Si el diario ya ocupa tanto como la foto, escribe una foto nueva: así cada
+    fila se reescribe una cantidad acotada de veces aunque el sketch tenga
+    cientos de filas.
+
+    Hay que llamarla después de guardar el checkpoint, cuando `bandas` tiene
+    justo las corridas terminadas que dice el checkpoint: una foto adelantada
+    contaría dos veces las corridas que se vuelvan a simular al reanudar.
+    """
+    if os.path.getsize(ruta + '.bandas_diario') >= os.path.getsize(ruta + '.bandas'):
+        guardar_bandas(ruta, bandas)
+
+
+def cargar_bandas(ruta, n_filas):
+    """
+    Rearma las bandas con sus primeras `n_filas` filas: la foto más las filas
+    del diario que no estaban en ella. Las que sobran se borran del diario.
+    """
+    with open(ruta + '.bandas', 'rb') as f:
+        bandas = pickle.load(f)
+    with open(ruta + '.bandas_diario', 'r+b') as f:
+        while bandas.n < n_filas:
+            indice, fila = pickle.load(f)
+            if indice >= bandas.n:  # Si se cortó antes de vaciar el diario, las primeras ya están en la foto
+                bandas.actualizar(fila)
+        f.truncate(f.tell())
+    return bandas
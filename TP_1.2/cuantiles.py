@@ -0,0 +1,111 @@
+import numpy as np
+
+# Cuantiles que se grafican como bandas (p1/p5/p50/p95/p99)
+CUANTILES_BANDAS = (0.01, 0.05, 0.50, 0.95, 0.99)
+
+
+class SketchCuantiles:
+    """
+    Sketch de cuantiles en streaming (tipo KLL), vectorizado por columnas.
+
+    Mantiene un resumen aproximado de la distribución de cada columna (por
+    ejemplo, el capital en cada tirada) a medida que llegan filas (corridas),
+    sin guardarlas todas. La memoria es O(k * log(n / k) * n_columnas) en vez de
+    O(n * n_columnas), y dos sketches armados por separado (por ejemplo, en
+    procesos distintos) se pueden fusionar.
+
+    Cada nivel h es una matriz (items x n_columnas) donde cada item pesa 2^h.
+    Cuando un nivel se llena se ordena cada columna y se sube al nivel
+    siguiente uno de cada dos items, empezando en un desplazamiento aleatorio.
+
+    Las filas no deben tener NaN.
+    """
+
+    def __init__(self, n_columnas, k=400, semilla=0):
+        self.n_columnas = n_columnas
+        self.k = k
+        self.n = 0
+        self._rng = np.random.default_rng(semilla)
+        self._buffer = []  # Filas sueltas del nivel 0, todavía sin apilar
+        self._niveles = [np.empty((0, n_columnas))]
+
+    def _capacidad(self, nivel):
+        # Los niveles de abajo (items livianos) tienen menos lugar que los de arriba
+        altura = len(self._niveles) - 1 - nivel
+        return max(2, int(np.ceil(self.k * (2 / 3) ** altura)))
+
+    def actualizar(self, filas):
+        """Agrega una fila (n_columnas,) o un lote de filas (b, n_columnas)."""
+        filas = np.asarray(filas, dtype=np.float64)
+        if filas.ndim == 1:
+            self._buffer.append(filas)
+            self.n += 1
+        else:
+            self._buffer.extend(filas)
+            self.n += len(filas)
+        if len(self._buffer) >= self._capacidad(0):
+            self._compactar()
+
+    def _volcar_buffer(self):
+        if self._buffer:
+            self._niveles[0] = np.vstack([self._niveles[0], np.array(self._buffer)])
+            self._buffer = []
+
+    def _compactar(self):
+        self._volcar_buffer()
+        nivel = 0
+        while nivel < len(self._niveles):
+            items = self._niveles[nivel]
+            if len(items) > self._capacidad(nivel):
+                items = np.sort(items, axis=0)
+                # Con cantidad impar, un item queda en el nivel (copiado: una vista retendría todo el nivel ordenado)
+                queda = items[-1:].copy() if len(items) % 2 else np.empty((0, self.n_columnas))
+                pares = items[:len(items) - len(queda)]
+                sube = pares[self._rng.integers(2)::2]
+                self._niveles[nivel] = queda
+                if nivel + 1 == len(self._niveles):
+                    self._niveles.append(np.empty((0, self.n_columnas)))
+                self._niveles[nivel + 1] = np.vstack([self._niveles[nivel + 1], sube])
+            nivel += 1
+
+    def fusionar(self, otro):
+        """Incorpora los datos de otro sketch con las mismas columnas."""
+        if otro.n_columnas != self.n_columnas:
+            raise ValueError("Solo se pueden fusionar sketches con la misma cantidad de columnas")
+        self._volcar_buffer()
+        otro._volcar_buffer()
+        while len(self._niveles) < len(otro._niveles):
+            self._niveles.append(np.empty((0, self.n_columnas)))
+        for nivel, items in enumerate(otro._niveles):
+            self._niveles[nivel] = np.vstack([self._niveles[nivel], items])
+        self.n += otro.n
+        self._compactar()
+        return self
+
+    def cuantiles(self, qs=CUANTILES_BANDAS):
+        """
+        Devuelve una matriz (len(qs), n_columnas) con los cuantiles aproximados
+        de cada columna. Si todavía no hay datos devuelve NaN.
+        """
+        qs = np.atleast_1d(qs)
+        if self.n == 0:
+            return np.full((len(qs), self.n_columnas), np.nan)
+        self._volcar_buffer()
+        items = np.vstack(self._niveles)
+        pesos = np.concatenate([np.full(len(nivel), 2.0 ** h) for h, nivel in enumerate(self._niveles)])
+
+        orden = np.argsort(items, axis=0)
+        valores = np.take_along_axis(items, orden, axis=0)
+        peso_acum = np.cumsum(pesos[orden], axis=0)
+        total = peso_acum[-1]
+
+        resultado = np.empty((len(qs), self.n_columnas))
+        for i, q in enumerate(qs):
+            # Primer item cuyo peso acumulado alcanza q * total
+            fila = np.argmax(peso_acum >= q * total, axis=0)
+            resultado[i] = np.take_along_axis(valores, fila[None, :], axis=0)[0]
+        return resultado
+
+    def tamano(self):
+        """Cantidad de items guardados (por columna)."""
+        return len(self._buffer) + sum(len(nivel) for nivel in self._niveles)
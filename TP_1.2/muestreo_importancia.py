@@ -0,0 +1,156 @@
+import numpy as np
+
+from apuestas import tabla_apuesta
+from todas_apuestas import simular_vectorizado
+
+# Cuantiles de la cola de pérdidas de ganancia_neta que se reportan
+CUANTILES_COLA = (0.001, 0.01, 0.05)
+
+# Inclinaciones que prueba la corrida piloto, como fracción de la prob. teórica
+FRACCIONES_PILOTO = (0.5, 0.6, 0.7, 0.8, 0.9)
+
+
+def distribucion_inclinada(gana, prob_victoria_is):
+    """
+    Probabilidades de cada número bajo la distribución inclinada: los números
+    ganadores se reparten prob_victoria_is y los perdedores el resto.
+    """
+    gana = np.asarray(gana, dtype=bool)
+    q = np.where(gana, prob_victoria_is / gana.sum(), (1 - prob_victoria_is) / (~gana).sum())
+    return q / q.sum()
+
+
+def _cuantil_ponderado(valores, pesos, q, n):
+    """Menor x tal que (1/n) * suma(pesos[valores <= x]) >= q."""
+    orden = np.argsort(valores)
+    acumulado = np.cumsum(pesos[orden]) / n
+    i = np.searchsorted(acumulado, q)
+    return valores[orden][min(i, len(valores) - 1)]
+
+
+def _muestrear(n_tiradas, n_corridas, gana, pago, prob_teorica, prob_victoria_is, estrategia, capital_inicial,
+               rng, tam_lote, reglas=None):
+    """Simula n_corridas bajo la distribución inclinada. Devuelve (pesos, ganancias, ruina)."""
+    q = distribucion_inclinada(gana, prob_victoria_is)
+    log_razon_victoria = np.log(prob_teorica / prob_victoria_is)
+    log_razon_derrota = np.log((1 - prob_teorica) / (1 - prob_victoria_is))
+    matriz_gana = np.array([gana])
+
+    pesos = np.empty(n_corridas)
+    ganancias = np.empty(n_corridas)
+    ruina = np.empty(n_corridas, dtype=bool)
+    for inicio in range(0, n_corridas, tam_lote):
+        n = min(tam_lote, n_corridas - inicio)
+        tiradas = rng.choice(37, size=(n, n_tiradas), p=q).astype(np.uint8)
+        res = simular_vectorizado(tiradas, matriz_gana, [pago], estrategia, 'f', capital_inicial, **(reglas or {}))
+        lote = slice(inicio, inicio + n)
+        pesos[lote] = np.exp(res['victorias'][0] * log_razon_victoria + res['derrotas'][0] * log_razon_derrota)
+        ganancias[lote] = res['ganancia_neta'][0]
+        ruina[lote] = res['bancarrota'][0]
+    return pesos, ganancias, ruina
+
+
+def elegir_inclinacion(n_tiradas, gana, pago, prob_teorica, estrategia, capital_inicial, rng,
+                       n_piloto=2000, fracciones=FRACCIONES_PILOTO, reglas=None):
+    """
+    Elige prob_victoria_is con una corrida piloto corta por cada candidata.
+
+    Inclinar de más también es malo: con muchas tiradas, las corridas que
+    igual ganan seguido reciben pesos enormes y la varianza explota. Se queda
+    con la candidata de menor error relativo en la probabilidad de ruina; si
+    ninguna observó ruinas, con la más inclinada.
+    """
+    mejor, mejor_error = prob_teorica * min(fracciones), np.inf
+    for fraccion in fracciones:
+        candidata = prob_teorica * fraccion
+        pesos, _, ruina = _muestrear(n_tiradas, n_piloto, gana, pago, prob_teorica, candidata, estrategia,
+                                     capital_inicial, rng, n_piloto, reglas)
+        contribucion = pesos * ruina
+        if contribucion.sum() == 0:
+            continue
+        error = contribucion.std(ddof=1) / contribucion.mean()
+        if error < mejor_error:
+            mejor, mejor_error = candidata, error
+    return mejor
+
+
+def simular_importancia(n_tiradas, n_corridas, seleccion, tipo_apuesta, estrategia='m', capital_inicial=1000,
+                        prob_victoria_is=None, semilla=None, tam_lote=10000, cuantiles=CUANTILES_COLA,
+                        n_bootstrap=200, reglas=None):
+    """
+    Estima la probabilidad de ruina y la cola de pérdidas de ganancia_neta con
+    muestreo por importancia (capital finito).
+
+    Las tiradas se sortean de una distribución inclinada en la que la apuesta
+    gana menos seguido (prob_victoria_is < prob. teórica), así las rachas de
+    derrotas que llevan a la ruina aparecen mucho más. Cada corrida se pondera
+    con su razón de verosimilitud
+        W = (p / q)^victorias * ((1 - p) / (1 - q))^derrotas
+    contando solo las tiradas jugadas (la corrida se corta en la bancarrota),
+    lo que deja los estimadores insesgados.
+
+    Args:
+        n_tiradas, n_corridas, seleccion, tipo_apuesta, estrategia, capital_inicial: Como en simular_ruleta
+        prob_victoria_is: Probabilidad de ganar bajo la distribución inclinada (default: la elige
+            elegir_inclinacion con una corrida piloto)
+        semilla: Semilla del generador de numpy
+        tam_lote: Corridas simuladas a la vez
+        cuantiles: Cuantiles de ganancia_neta a estimar
+        n_bootstrap: Remuestreos para los intervalos de confianza de los cuantiles
+        reglas: apuesta_base, fibonacci, reinicio_paroli y limite_mesa (ver simular_ruleta)
+
+    Returns:
+        Diccionario con las estimaciones y sus intervalos de confianza del 95%
+    """
+    gana, prob_teorica, pago = tabla_apuesta(tipo_apuesta, seleccion)
+    rng = np.random.default_rng(semilla)
+    if prob_victoria_is is None:
+        prob_victoria_is = elegir_inclinacion(n_tiradas, gana, pago, prob_teorica, estrategia, capital_inicial, rng,
+                                              reglas=reglas)
+    if not 0 < prob_victoria_is < 1:
+        raise ValueError("prob_victoria_is debe estar entre 0 y 1")
+
+    pesos, ganancias, ruina = _muestrear(n_tiradas, n_corridas, gana, pago, prob_teorica, prob_victoria_is,
+                                         estrategia, capital_inicial, rng, tam_lote, reglas)
+
+    # Probabilidad de ruina: promedio de W * 1{ruina}
+    contribucion = pesos * ruina
+    p_ruina = contribucion.mean()
+    error = contribucion.std(ddof=1) / np.sqrt(n_corridas) if n_corridas > 1 else np.nan
+
+    # Cuantiles de la cola, con intervalos por bootstrap
+    estimados = [_cuantil_ponderado(ganancias, pesos, c, n_corridas) for c in cuantiles]
+    remuestreos = np.empty((n_bootstrap, len(cuantiles)))
+    for b in range(n_bootstrap):
+        idx = rng.integers(0, n_corridas, n_corridas)
+        remuestreos[b] = [_cuantil_ponderado(ganancias[idx], pesos[idx], c, n_corridas) for c in cuantiles]
+
+    return {
+        'n_corridas': n_corridas,
+        'prob_victoria': prob_teorica,
+        'prob_victoria_is': prob_victoria_is,
+        'prob_ruina': p_ruina,
+        'prob_ruina_ic95': (p_ruina - 1.96 * error, p_ruina + 1.96 * error),
+        'error_relativo': error / p_ruina if p_ruina > 0 else np.nan,
+        'ruinas_observadas': int(ruina.sum()),
+        'ganancia_neta_media': (pesos * ganancias).mean(),
+        'cuantiles': {c: (est, tuple(np.percentile(remuestreos[:, j], [2.5, 97.5])))
+                      for j, (c, est) in enumerate(zip(cuantiles, estimados))},
+        # Tamaño de muestra efectivo: cuántas corridas "valen" las muestras ponderadas
+        'tamano_efectivo': pesos.sum() ** 2 / (pesos ** 2).sum(),
+    }
+
+
+def mostrar_importancia(reporte, estrategia, capital_inicial):
+    """Imprime el reporte de simular_importancia."""
+    print("\n" + "=" * 60)
+    print(f"Muestreo por importancia - Estrategia: {estrategia.upper()} - Capital inicial: {capital_inicial}")
+    print("=" * 60)
+    print(f"Corridas: {reporte['n_corridas']} (tamaño efectivo: {reporte['tamano_efectivo']:.1f})")
+    print(f"Prob. de ganar: teórica {reporte['prob_victoria']:.4f}, inclinada {reporte['prob_victoria_is']:.4f}")
+    bajo, alto = reporte['prob_ruina_ic95']
+    print(f"Prob. de ruina: {reporte['prob_ruina']:.6g}  IC 95%: [{bajo:.6g}, {alto:.6g}]  "
+          f"(error relativo {reporte['error_relativo']:.2%}, {reporte['ruinas_observadas']} ruinas observadas)")
+    print(f"Ganancia neta media: {reporte['ganancia_neta_media']:.2f}")
+    for c, (est, (bajo, alto)) in reporte['cuantiles'].items():
+        print(f"Cuantil {c:g} de ganancia neta: {est:.2f}  IC 95%: [{bajo:.2f}, {alto:.2f}]")
@@ -0,0 +1,298 @@
+"""
+Búsqueda de las mejores reglas para una estrategia: apuesta base, tabla de
+Fibonacci, reinicio de Paroli y límite de mesa.
+
+Probar toda la grilla con muchas corridas es carísimo, así que se usa halving
+sucesivo: todos los candidatos se evalúan con pocas corridas, se queda el
+mejor tercio (con --eta 3), ese tercio se evalúa con el triple de corridas,
+y así hasta llegar a --max_corridas. Nunca quedan menos de eta finalistas
+(salvo que la grilla sea más chica): las corridas de las últimas rondas
+sirven para compararlos, no para seguir midiendo a un único ganador. Todos
+los candidatos juegan las mismas tiradas (números aleatorios comunes), así
+las diferencias entre ellos no se pierden en el ruido de haber sorteado
+tiradas distintas.
+
+Uso:
+    python optimizacion.py -s m -e rojo --objetivo ruina
+    python optimizacion.py -s f -e rojo --objetivo mediana --largos_fibonacci 5,7,9,12
+"""
+import os
+import sys
+import math
+import argparse
+import itertools
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utilidades import perfilado
+from apuestas import FIBONACCI, REINICIO_PAROLI, deducir_tipo_apuesta, tabla_apuesta, validar_seleccion
+from todas_apuestas import simular_vectorizado
+
+# Objetivos posibles; el puntaje de cada uno se minimiza
+OBJETIVOS = {
+    'ruina': 'probabilidad de ruina (menor es mejor)',
+    'mediana': 'mediana de la ganancia neta (mayor es mejor)',
+    'tiempo': 'tiradas hasta la ruina, cortadas en n_tiradas (mayor es mejor)',
+}
+
+
+def tabla_fibonacci(largo):
+    """Primeros `largo` términos de Fibonacci (1, 1, 2, 3, 5, ...)."""
+    tabla = [1, 1]
+    while len(tabla) < largo:
+        tabla.append(tabla[-1] + tabla[-2])
+    return tabla[:largo]
+
+
+def espacio_candidatos(estrategia, apuestas_base, limites_mesa, largos_fibonacci, reinicios_paroli):
+    """
+    Arma las configuraciones a probar para una estrategia.
+
+    Los parámetros que la estrategia no usa (la tabla de Fibonacci fuera de
+    Fibonacci, el reinicio fuera de Paroli) quedan en su valor de siempre, y
+    se descartan los límites de mesa menores que la apuesta base.
+    """
+    fibonaccis = [tabla_fibonacci(largo) for largo in largos_fibonacci] if estrategia == 'f' else [FIBONACCI]
+    reinicios = reinicios_paroli if estrategia == 'o' else [REINICIO_PAROLI]
+    return [{'apuesta_base': base, 'fibonacci': fibonacci, 'reinicio_paroli': reinicio, 'limite_mesa': limite}
+            for base, limite, fibonacci, reinicio in itertools.product(apuestas_base, limites_mesa, fibonaccis, reinicios)
+            if limite is None or limite >= base]
+
+
+def evaluar(candidatos, tiradas, gana, pago, estrategia, capital_tipo, capital_inicial):
+    """
+    Juega todos los candidatos sobre las mismas tiradas.
+
+    Cada candidato es una fila de simular_vectorizado (apuesta base, reinicio
+    y límite van uno por fila); solo la tabla de Fibonacci es común a la
+    pasada, así que se hace una pasada por tabla distinta.
+
+    Returns:
+        Diccionario de matrices (n_candidatos, n_corridas): 'ganancia_neta',
+        'ruina' y 'tiempo' (tiradas jugadas hasta la ruina, o n_tiradas si no hubo)
+    """
+    n_corridas, n_tiradas = tiradas.shape
+    forma = (len(candidatos), n_corridas)
+    metricas = {'ganancia_neta': np.empty(forma), 'ruina': np.empty(forma, dtype=bool),
+                'tiempo': np.empty(forma, dtype=np.int64)}
+
+    grupos = {}
+    for k, candidato in enumerate(candidatos):
+        grupos.setdefault(tuple(candidato['fibonacci']), []).append(k)
+
+    for fibonacci, indices in grupos.items():
+        filas = [candidatos[k] for k in indices]
+        limites = [c['limite_mesa'] for c in filas]
+        res = simular_vectorizado(
+            tiradas, np.repeat(np.asarray(gana, dtype=bool)[None, :], len(filas), axis=0), [pago] * len(filas),
+            estrategia, capital_tipo, capital_inicial,
+            apuesta_base=[c['apuesta_base'] for c in filas], fibonacci=list(fibonacci),
+            reinicio_paroli=[c['reinicio_paroli'] for c in filas],
+            limite_mesa=None if all(l is None for l in limites) else [np.inf if l is None else l for l in limites])
+        ruina = res['bancarrota']
+        metricas['ganancia_neta'][indices] = res['ganancia_neta']
+        metricas['ruina'][indices] = ruina
+        metricas['tiempo'][indices] = np.where(ruina, res['jugadas'], n_tiradas)
+    return metricas
+
+
+def puntajes(objetivo, metricas):
+    """Puntaje de cada candidato según el objetivo (menor es mejor)."""
+    if objetivo == 'ruina':
+        return metricas['ruina'].mean(axis=1)
+    if objetivo == 'mediana':
+        return -np.median(metricas['ganancia_neta'], axis=1)
+    return -metricas['tiempo'].mean(axis=1)
+
+
+def _ordenar(objetivo, metricas):
+    # Desempate: la ganancia mediana (o la ruina, si el objetivo ya es la ganancia)
+    desempate = (metricas['ruina'].mean(axis=1) if objetivo == 'mediana'
+                 else -np.median(metricas['ganancia_neta'], axis=1))
+    return np.lexsort((desempate, puntajes(objetivo, metricas)))
+
+
+def optimizar(candidatos, n_tiradas, seleccion, tipo_apuesta, estrategia, capital_tipo='f', capital_inicial=1000,
+              objetivo='mediana', corridas_iniciales=20, eta=3, max_corridas=2000, semilla=None):
+    """
+    Halving sucesivo sobre los candidatos.
+
+    En cada ronda los candidatos que siguen juegan las corridas nuevas (las
+    mismas para todos) hasta llegar al total de la ronda; se ordenan por el
+    puntaje sobre todas sus corridas y pasa 1 de cada `eta`, pero siempre
+    pasan al menos `eta` (o todos, si son menos). El total de corridas se
+    multiplica por `eta` en cada ronda, hasta `max_corridas`.
+
+    Returns:
+        (finalistas, rondas): finalistas es una lista ordenada de diccionarios
+        con el candidato y sus métricas sobre max_corridas corridas; rondas es
+        una lista de (candidatos evaluados, corridas por candidato)
+    """
+    if objetivo not in OBJETIVOS:
+        raise ValueError(f"Objetivo desconocido: {objetivo}")
+    if objetivo in ('ruina', 'tiempo') and capital_tipo != 'f':
+        raise ValueError("Los objetivos 'ruina' y 'tiempo' necesitan capital finito")
+
+    gana, _, pago = tabla_apuesta(tipo_apuesta, seleccion)
+    rng = np.random.default_rng(semilla)
+    tiradas = np.empty((0, n_tiradas), dtype=np.uint8)
+
+    vivos = list(range(len(candidatos)))
+    acumuladas = None  # Métricas de los vivos sobre todas las corridas jugadas hasta ahora
+    rondas = []
+    objetivo_corridas = min(corridas_iniciales, max_corridas)
+    while True:
+        # Tiradas comunes: las nuevas corridas se sortean una sola vez para todos
+        jugadas = len(tiradas) if acumuladas is None else acumuladas['ruina'].shape[1]
+        if objetivo_corridas > len(tiradas):
+            nuevas = rng.integers(0, 37, size=(objetivo_corridas - len(tiradas), n_tiradas), dtype=np.uint8)
+            tiradas = np.concatenate([tiradas, nuevas])
+        nuevas = evaluar([candidatos[k] for k in vivos], tiradas[jugadas:objetivo_corridas], gana, pago,
+                         estrategia, capital_tipo, capital_inicial)
+        if acumuladas is None:
+            acumuladas = nuevas
+        else:
+            acumuladas = {clave: np.concatenate([acumuladas[clave], nuevas[clave]], axis=1) for clave in nuevas}
+        rondas.append((len(vivos), objetivo_corridas))
+
+        orden = _ordenar(objetivo, acumuladas)
+        if objetivo_corridas >= max_corridas:
+            break
+        quedan = orden[:max(min(eta, len(vivos)), math.ceil(len(vivos) / eta))]
+        vivos = [vivos[i] for i in quedan]
+        acumuladas = {clave: valores[quedan] for clave, valores in acumuladas.items()}
+        objetivo_corridas = min(objetivo_corridas * eta, max_corridas)
+
+    finalistas = []
+    for i in orden:
+        ruina = acumuladas['ruina'][i]
+        finalistas.append({
+            'candidato': candidatos[vivos[i]],
+            'puntaje': puntajes(objetivo, {clave: valores[i:i + 1] for clave, valores in acumuladas.items()})[0],
+            'prob_ruina': ruina.mean(),
+            'prob_ruina_ic95': 1.96 * np.sqrt(ruina.mean() * (1 - ruina.mean()) / len(ruina)),
+            'ganancia_neta_mediana': np.median(acumuladas['ganancia_neta'][i]),
+            'ganancia_neta_media': acumuladas['ganancia_neta'][i].mean(),
+            'tiempo_medio': acumuladas['tiempo'][i].mean(),
+            'n_corridas': len(ruina),
+        })
+    return finalistas, rondas
+
+
+def argumentos_cli(candidato, estrategia, seleccion, tipo_apuesta, n_tiradas, capital_tipo, capital_inicial):
+    """Argumentos de simulacion1.2.py que reproducen un candidato con la apuesta optimizada."""
+    partes = [f'-s {estrategia}', f'-e {seleccion}', f'--tipo_apuesta {tipo_apuesta}', f'-n {n_tiradas}',
+              f'-a {capital_tipo}']
+    if capital_tipo == 'f':
+        partes.append(f'--capital_inicial {capital_inicial}')
+    partes.append(f'--apuesta_base {candidato["apuesta_base"]}')
+    if estrategia == 'f':
+        partes.append('--fibonacci ' + ','.join(map(str, candidato['fibonacci'])))
+    if estrategia == 'o':
+        partes.append(f'--reinicio_paroli {candidato["reinicio_paroli"]}')
+    if candidato['limite_mesa'] is not None:
+        partes.append(f'--limite_mesa {candidato["limite_mesa"]}')
+    return ' '.join(partes)
+
+
+def mostrar_optimizacion(finalistas, rondas, n_candidatos, estrategia, objetivo, max_corridas, seleccion,
+                         tipo_apuesta, n_tiradas, capital_tipo, capital_inicial):
+    """
+    Imprime las rondas del halving, la tabla de finalistas y el comando de
+    simulacion1.2.py que reproduce al mejor (seleccion, tipo_apuesta,
+    n_tiradas, capital_tipo y capital_inicial son los de la búsqueda).
+    """
+    print("\n" + "=" * 100)
+    print(f"Optimización - Estrategia: {estrategia.upper()} - Objetivo: {OBJETIVOS[objetivo]}")
+    print("=" * 100)
+    for ronda, (evaluados, corridas) in enumerate(rondas, start=1):
+        print(f"Ronda {ronda}: {evaluados} candidatos x {corridas} corridas")
+    # Corridas realmente simuladas: cada ronda solo agrega las que le faltaban a los que siguen
+    simuladas = sum(evaluados * (corridas - (rondas[r - 1][1] if r else 0))
+                    for r, (evaluados, corridas) in enumerate(rondas))
+    print(f"Corridas simuladas: {simuladas} (grilla completa: {n_candidatos * max_corridas})")
+
+    print(f"\n{'apuesta base':>12}{'fibonacci':>10}{'reinicio':>10}{'límite':>9}"
+          f"{'prob. ruina':>20}{'gan. mediana':>14}{'gan. media':>12}{'tiempo medio':>14}")
+    for fila in finalistas:
+        c = fila['candidato']
+        print(f"{c['apuesta_base']:>12}{len(c['fibonacci']):>10}{c['reinicio_paroli']:>10}"
+              f"{'-' if c['limite_mesa'] is None else c['limite_mesa']:>9}"
+              f"{fila['prob_ruina']:>11.4f} ± {fila['prob_ruina_ic95']:<6.4f}{fila['ganancia_neta_mediana']:>14.2f}"
+              f"{fila['ganancia_neta_media']:>12.2f}{fila['tiempo_medio']:>14.1f}")
+    argumentos = argumentos_cli(finalistas[0]['candidato'], estrategia, seleccion, tipo_apuesta, n_tiradas,
+                                capital_tipo, capital_inicial)
+    print(f"\nMejor configuración: python simulacion1.2.py {argumentos}")
+
+
+def _lista(tipo):
+    """Convierte 'a,b,c' en una lista; 'ninguno' vale None (sin límite de mesa)."""
+    def convertir(texto):
+        return [None if x.strip() == 'ninguno' else tipo(x) for x in texto.split(',')]
+    return convertir
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Búsqueda de reglas de estrategia con halving sucesivo')
+    parser.add_argument('-s', choices=['m', 'd', 'f', 'o', 'p'], default='m',
+                        help='Estrategia: m (Martingala), d (D\'Alembert), f (Fibonacci), o (Paroli), p (Pleno)')
+    parser.add_argument('-e', default='rojo', help='Selección a apostar (default=rojo)')
+    parser.add_argument('--tipo_apuesta', choices=['numero', 'color', 'docena', 'columna', 'par_impar', 'alto_bajo'],
+                        default=None, help='Tipo de apuesta (default=deducido de -e)')
+    parser.add_argument('-n', type=int, default=1000, help='Tiradas por corrida (default=1000)')
+    parser.add_argument('-a', choices=['i', 'f'], default='f', help='Capital: i (infinito) o f (finito) (default=f)')
+    parser.add_argument('--capital_inicial', type=int, default=1000, help='Capital inicial (default=1000)')
+    parser.add_argument('--objetivo', choices=list(OBJETIVOS), default='mediana',
+                        help='Qué optimizar: ruina, mediana o tiempo (default=mediana)')
+    parser.add_argument('--apuestas_base', type=_lista(int), default=[1, 5, 10, 25, 50],
+                        help='Apuestas base a probar (default=1,5,10,25,50)')
+    parser.add_argument('--limites_mesa', type=_lista(int), default=[None, 100, 500, 1000],
+                        help='Límites de mesa a probar; "ninguno" es sin límite (default=ninguno,100,500,1000)')
+    parser.add_argument('--largos_fibonacci', type=_lista(int), default=[5, 7, 9, 12],
+                        help='Largos de la tabla de Fibonacci a probar (solo -s f) (default=5,7,9,12)')
+    parser.add_argument('--reinicios_paroli', type=_lista(int), default=[1, 2, 3, 4, 5],
+                        help='Reinicios de Paroli a probar (solo -s o) (default=1,2,3,4,5)')
+    parser.add_argument('--corridas_iniciales', type=int, default=20,
+                        help='Corridas por candidato en la primera ronda (default=20)')
+    parser.add_argument('--eta', type=int, default=3,
+                        help='En cada ronda pasa 1 de cada eta candidatos y las corridas se multiplican por eta (default=3)')
+    parser.add_argument('--max_corridas', type=int, default=2000,
+                        help='Corridas de la última ronda (default=2000)')
+    parser.add_argument('--semilla', type=int, default=None, help='Semilla de las tiradas (opcional)')
+    perfilado.agregar_argumentos(parser)
+    args = parser.parse_args()
+    if args.eta < 2:
+        parser.error('--eta tiene que ser al menos 2')
+    if args.objetivo in ('ruina', 'tiempo') and args.a != 'f':
+        parser.error(f'--objetivo {args.objetivo} necesita capital finito (-a f)')
+    perfil = perfilado.crear_perfilador(args, 'TP_1.2 optimizacion')
+
+    try:
+        seleccion = int(args.e)
+    except ValueError:
+        seleccion = args.e.lower()
+    tipo_apuesta = args.tipo_apuesta
+    if tipo_apuesta is None:
+        tipo_apuesta = deducir_tipo_apuesta(seleccion)
+        if tipo_apuesta is None:
+            parser.error(f"No se puede deducir el tipo de apuesta de -e {args.e}; indicalo con --tipo_apuesta")
+    try:
+        validar_seleccion(tipo_apuesta, seleccion)
+    except ValueError as e:
+        parser.error(str(e))
+
+    candidatos = espacio_candidatos(args.s, args.apuestas_base, args.limites_mesa,
+                                    args.largos_fibonacci, args.reinicios_paroli)
+    with perfilado.medir_fase(perfil, 'halving'):
+        finalistas, rondas = optimizar(candidatos, args.n, seleccion, tipo_apuesta, args.s,
+                                       capital_tipo=args.a, capital_inicial=args.capital_inicial,
+                                       objetivo=args.objetivo, corridas_iniciales=args.corridas_iniciales,
+                                       eta=args.eta, max_corridas=args.max_corridas, semilla=args.semilla)
+    mostrar_optimizacion(finalistas, rondas, len(candidatos), args.s, args.objetivo, args.max_corridas, seleccion,
+                         tipo_apuesta, args.n, args.a, args.capital_inicial)
+    perfilado.cerrar_perfilador(perfil, args)
+
+
+if __name__ == '__main__':
+    main()
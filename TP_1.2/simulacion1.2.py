@@ -1,10 +1,28 @@
+import os
+import sys
+import time
+import hashlib
 import random
 import argparse
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.ticker import PercentFormatter
 
-def simular_ruleta(n_tiradas, n_corridas, seleccion=None, estrategia='m', capital_tipo='i', capital_inicial=1000, tipo_apuesta='numero'):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utilidades import perfilado, progresivo, distribuido
+from cuantiles import SketchCuantiles, CUANTILES_BANDAS
+from checkpoint import (guardar_checkpoint, cargar_checkpoint, agregar_curvas, cargar_curvas, reescribir_curvas,
+                        guardar_bandas, agregar_fila_bandas, compactar_bandas, cargar_bandas)
+from victorias import SERIES, SerieDerivada, empaquetar, desempaquetar
+from apuestas import (APUESTA_BASE, FIBONACCI, REINICIO_PAROLI, deducir_tipo_apuesta, tabla_apuesta,
+                      validar_seleccion)
+from todas_apuestas import simular_todas_las_apuestas, mostrar_todas_las_apuestas
+from muestreo_importancia import simular_importancia, mostrar_importancia
+
+
+def simular_ruleta(n_tiradas, n_corridas, seleccion=None, estrategia='m', capital_tipo='i', capital_inicial=1000, tipo_apuesta='numero', perfil=None,
+                   checkpoint=None, checkpoint_cada=100000, reanudar_desde=None, apuesta_base=APUESTA_BASE,
+                   fibonacci=FIBONACCI, reinicio_paroli=REINICIO_PAROLI, limite_mesa=None, guardar_curvas=True):
     """
     Simula múltiples corridas de una ruleta con diversas estrategias de apuesta
     
@@ -16,26 +34,24 @@ def simular_ruleta(n_tiradas, n_corridas, seleccion=None, estrategia='m', capita
         capital_tipo: Tipo de capital ('i': infinito, 'f': finito)
         capital_inicial: Capital inicial para capital finito
         tipo_apuesta: Tipo de apuesta ('numero', 'color', 'docena', 'columna', 'par_impar', 'alto_bajo')
+        perfil: Perfilador opcional para medir el tiempo de cada fase de la simulación
+        checkpoint: Archivo donde guardar periódicamente el estado de la simulación (opcional).
+            Las curvas y bandas de cada corrida terminada se agregan una sola vez
+            a archivos aparte (ver checkpoint.py)
+        checkpoint_cada: Cantidad de tiradas jugadas entre checkpoints
+        reanudar_desde: Datos de un checkpoint (ver cargar_simulacion) desde donde continuar
+        apuesta_base: Apuesta inicial de todas las estrategias
+        fibonacci: Tabla de multiplicadores de Fibonacci
+        reinicio_paroli: Victorias seguidas tras las que Paroli vuelve a la apuesta base
+        limite_mesa: Apuesta máxima que acepta la mesa (None = sin límite)
+        guardar_curvas: Si es False, de las curvas por tirada (capital, ganancias y
+            victorias) solo se guardan las de la primera corrida; del resto quedan
+            los valores finales y las bandas de cuantiles, así la memoria no crece
+            con n_corridas
     """
     # Configuración de la ruleta (europea: 0-36)
     numeros_ruleta = list(range(37))
     
-    # Definición de grupos de apuestas
-    rojos = {1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}
-    negros = set(range(1,37)) - rojos
-    
-    docenas = {
-        1: range(1,13),
-        2: range(13,25),
-        3: range(25,37)
-    }
-    
-    columnas = {
-        1: {1,4,7,10,13,16,19,22,25,28,31,34},
-        2: {2,5,8,11,14,17,20,23,26,29,32,35},
-        3: {3,6,9,12,15,18,21,24,27,30,33,36}
-    }
-    
     # Determinar automáticamente el tipo de apuesta si no se especifica
     if tipo_apuesta is None:
         if isinstance(seleccion, int):
@@ -54,193 +70,431 @@ def simular_ruleta(n_tiradas, n_corridas, seleccion=None, estrategia='m', capita
             tipo_apuesta = 'numero'  # Default
     
     # Validar selección según tipo de apuesta inferido
-    if tipo_apuesta == 'numero' and seleccion is not None and not (0 <= seleccion <= 36):
-        raise ValueError("Para apuesta a número, la selección debe estar entre 0 y 36")
-    elif tipo_apuesta == 'color' and seleccion not in ['rojo', 'negro']:
-        raise ValueError("Para apuesta a color, la selección debe ser 'rojo' o 'negro'")
-    elif tipo_apuesta == 'docena' and seleccion not in [1, 2, 3]:
-        raise ValueError("Para apuesta a docena, la selección debe ser 1, 2 o 3")
-    elif tipo_apuesta == 'columna' and seleccion not in [1, 2, 3]:
-        raise ValueError("Para apuesta a columna, la selección debe ser 1, 2 o 3")
-    elif tipo_apuesta == 'par_impar' and seleccion not in ['par', 'impar']:
-        raise ValueError("Para apuesta a par/impar, la selección debe ser 'par' o 'impar'")
-    elif tipo_apuesta == 'alto_bajo' and seleccion not in ['alto', 'bajo']:
-        raise ValueError("Para apuesta a alto/bajo, la selección debe ser 'alto' o 'bajo'")
+    validar_seleccion(tipo_apuesta, seleccion)
     
-    # Calcular probabilidad teórica según tipo de apuesta
-    if tipo_apuesta == 'numero':
-        prob_teorica = 1/37
-        pago = 35  # Pago 35:1
-    elif tipo_apuesta == 'color':
-        prob_teorica = 18/37
-        pago = 1  # Pago 1:1
-    elif tipo_apuesta == 'docena' or tipo_apuesta == 'columna':
-        prob_teorica = 12/37
-        pago = 2  # Pago 2:1
-    elif tipo_apuesta == 'par_impar' or tipo_apuesta == 'alto_bajo':
-        prob_teorica = 18/37
-        pago = 1  # Pago 1:1
-    else:
-        prob_teorica = None
-        pago = None
-
-    # Almacenar resultados de todas las corridas
-    resultados = {
-        'frecuencias': [],
-        'capital': [],
-        'ganancias_perdidas': [],  # Nuevo: registro de ganancias/pérdidas
-        'victorias_acumuladas': [],
-        'win_loss_ratio': [],
-        'bancarrotas': 0,
-        'capital_final': [],
-        'ganancia_neta': [],
-        'tipo_apuesta': tipo_apuesta,
-        'seleccion': seleccion
+    gana, prob_teorica, pago = tabla_apuesta(tipo_apuesta, seleccion)
+
+    parametros = {
+        'n_tiradas': n_tiradas, 'n_corridas': n_corridas, 'seleccion': seleccion,
+        'estrategia': estrategia, 'capital_tipo': capital_tipo,
+        'capital_inicial': capital_inicial, 'tipo_apuesta': tipo_apuesta,
+        'apuesta_base': apuesta_base, 'fibonacci': list(fibonacci),
+        'reinicio_paroli': reinicio_paroli, 'limite_mesa': limite_mesa,
+        'guardar_curvas': guardar_curvas
     }
-
-    for _ in range(n_corridas):
-        # Inicializar capital y ganancias/pérdidas
-        capital = capital_inicial if capital_tipo == 'f' else float('inf')
-        ganancias_perdidas = 0  # Registro de ganancias/pérdidas acumuladas
-        capital_acum = []
-        ganancias_perdidas_acum = []  # Registro acumulado de ganancias/pérdidas
-        en_bancarrota = False
+    reglas = {'apuesta_base': apuesta_base, 'fibonacci': list(fibonacci),
+              'reinicio_paroli': reinicio_paroli, 'limite_mesa': limite_mesa}
+
+    if reanudar_desde is not None:
+        # Continuar una simulación guardada: resultados, corrida en curso y estado de random
+        resultados = reanudar_desde['resultados']
+        primera_corrida = reanudar_desde['corrida']
+        en_curso = reanudar_desde['en_curso']
+        random.setstate(reanudar_desde['rng'])
+    else:
+        # Almacenar resultados de todas las corridas (las curvas, solo de la primera si guardar_curvas=False)
+        resultados = {
+            'capital': [],
+            'ganancias_perdidas': [],  # Nuevo: registro de ganancias/pérdidas
+            # Victorias de cada corrida, 1 bit por tirada jugada (np.packbits), y cuántas tiradas se jugaron
+            'victorias_bits': [],
+            'jugadas': [],
+            'bancarrotas': 0,
+            'capital_final': [],
+            'ganancia_neta': [],
+            'tipo_apuesta': tipo_apuesta,
+            'seleccion': seleccion,
+            # Bandas de cuantiles por tirada (ganancias si el capital es infinito, capital si es finito)
+            'bandas': SketchCuantiles(n_tiradas),
+            # Estado de la estrategia al final de cada corrida (para poder extenderlas; solo con guardar_curvas)
+            'estados_finales': []
+        }
+        # frecuencias, victorias_acumuladas y win_loss_ratio se calculan al pedirlas, desde victorias_bits
+        for nombre in SERIES:
+            resultados[nombre] = SerieDerivada(resultados, nombre)
+        primera_corrida = 0
+        en_curso = None
+        if checkpoint is not None:
+            reescribir_curvas(checkpoint, [])
+            guardar_bandas(checkpoint, resultados['bandas'])
+
+    faltan_foto = checkpoint_cada if checkpoint is not None else 0
+
+    for corrida in range(primera_corrida, n_corridas):
+        if perfil is not None:
+            perfil.reiniciar_marca()
+
+        # Estado de random al empezar la corrida: al reanudar se vuelven a generar las mismas tiradas
+        rng_corrida = random.getstate() if checkpoint is not None else None
+
+        if en_curso is not None:
+            estado = en_curso
+            en_curso = None
+        else:
+            estado = _estado_corrida_inicial(capital_tipo, capital_inicial, apuesta_base)
 
         # Simular tiradas
         tiradas = [random.choice(numeros_ruleta) for _ in range(n_tiradas)]
+        if perfil is not None:
+            perfil.marcar('generacion')
+
+        if checkpoint is not None:
+            def guardar(estado_parcial, corrida=corrida, rng_corrida=rng_corrida):
+                guardar_checkpoint(checkpoint, {
+                    'parametros': parametros, 'resultados': _resultados_livianos(resultados),
+                    'corrida': corrida, 'rng': rng_corrida, 'en_curso': estado_parcial, 'completo': False
+                })
+                compactar_bandas(checkpoint, resultados['bandas'])
+        else:
+            guardar = None
+
+        faltan_foto = _jugar_tiradas(estado, tiradas, 0, n_tiradas, gana, pago, estrategia,
+                                     capital_tipo, seleccion, perfil, guardar, checkpoint_cada, faltan_foto,
+                                     **reglas)
+        _cerrar_corrida(resultados, estado, n_tiradas, capital_tipo, capital_inicial, perfil,
+                        guardar_curvas)
+        if checkpoint is not None:
+            # Lo que deja la corrida va al final de los archivos aparte; el checkpoint queda chico
+            if guardar_curvas or corrida == 0:
+                agregar_curvas(checkpoint, _registro_curvas(resultados, corrida))
+            agregar_fila_bandas(checkpoint, corrida,
+                                estado['ganancias_perdidas_acum'] if capital_tipo == 'i' else estado['capital_acum'])
+
+    if checkpoint is not None:
+        # Checkpoint final: sirve para extender la simulación con más corridas o tiradas
+        guardar_checkpoint(checkpoint, {
+            'parametros': parametros, 'resultados': _resultados_livianos(resultados),
+            'corrida': n_corridas, 'rng': random.getstate(), 'en_curso': None, 'completo': True
+        })
+        compactar_bandas(checkpoint, resultados['bandas'])
+
+    return resultados
+
+
+def _registro_curvas(resultados, corrida):
+    """Curvas por tirada de una corrida, como se guardan en el archivo de curvas del checkpoint."""
+    return (resultados['capital'][corrida], resultados['ganancias_perdidas'][corrida],
+            resultados['victorias_bits'][corrida], resultados['jugadas'][corrida])
 
-        # Estadísticas acumulativas
-        fr_acum = []  # Frecuencia relativa acumulada
-        victorias_acum = []  # Victorias acumuladas
-        win_loss_acum = []  # Relación victorias/derrotas
-        conteo_victorias = 0
-        conteo_derrotas = 0
-        conteo = 0
 
+def _resultados_livianos(resultados):
+    """
+    Resultados tal como van al checkpoint: valores finales, bancarrotas y
+    estados finales. Las curvas y las bandas ya están en sus archivos aparte,
+    y las series derivadas se rearman al cargar (ver cargar_simulacion).
+    """
+    livianos = {clave: valor for clave, valor in resultados.items() if clave not in SERIES}
+    livianos.update(capital=[], ganancias_perdidas=[], victorias_bits=[], jugadas=[], bandas=None)
+    return livianos
+
+
+def cargar_simulacion(ruta):
+    """
+    Carga un checkpoint de simular_ruleta con los resultados completos: le
+    vuelve a agregar las curvas y las bandas de sus archivos aparte y las
+    series derivadas de las victorias.
+    """
+    datos = cargar_checkpoint(ruta)
+    resultados = datos['resultados']
+    terminadas = len(resultados['capital_final'])
+    con_curvas = terminadas if datos['parametros']['guardar_curvas'] else min(terminadas, 1)
+    for capital, ganancias_perdidas, bits, jugadas in cargar_curvas(ruta, con_curvas):
+        resultados['capital'].append(capital)
+        resultados['ganancias_perdidas'].append(ganancias_perdidas)
+        resultados['victorias_bits'].append(bits)
+        resultados['jugadas'].append(jugadas)
+    resultados['bandas'] = cargar_bandas(ruta, terminadas)
+    for nombre in SERIES:
+        resultados[nombre] = SerieDerivada(resultados, nombre)
+    return datos
+
+
+def _estado_corrida_inicial(capital_tipo, capital_inicial, apuesta_base=APUESTA_BASE):
+    """Estado de una corrida antes de la primera tirada."""
+    return {
+        'i': 1,  # Próxima tirada a jugar
+        'capital': capital_inicial if capital_tipo == 'f' else float('inf'),
+        'ganancias_perdidas': 0,  # Registro de ganancias/pérdidas acumuladas
+        'en_bancarrota': False,
         # Variables para estrategias
-        apuesta_base = 10
-        apuesta_actual = apuesta_base
-        victorias_consecutivas = 0
-        fibonacci = [1, 1, 2, 3, 5, 8, 13, 21, 34]
-        fib_index = 0
-
-        for i in range(1, n_tiradas + 1):
-            if capital_tipo == 'f' and capital <= 0:
-                en_bancarrota = True
-                break
-
-            if capital_tipo == 'f' and apuesta_actual > capital:
-                apuesta_actual = capital  # No apostar más del capital disponible
-
-            # Determinar si ganó la apuesta
-            gano = False
-            numero_salido = tiradas[i - 1]
-            
-            if tipo_apuesta == 'numero':
-                gano = (seleccion is not None and numero_salido == seleccion)
-            elif tipo_apuesta == 'color':
-                if seleccion == 'rojo':
-                    gano = (numero_salido in rojos)
-                elif seleccion == 'negro':
-                    gano = (numero_salido in negros)
-            elif tipo_apuesta == 'docena':
-                gano = (numero_salido in docenas.get(seleccion, set()))
-            elif tipo_apuesta == 'columna':
-                gano = (numero_salido in columnas.get(seleccion, set()))
-            elif tipo_apuesta == 'par_impar':
-                if seleccion == 'par':
-                    gano = (numero_salido != 0 and numero_salido % 2 == 0)
-                elif seleccion == 'impar':
-                    gano = (numero_salido % 2 == 1)
-            elif tipo_apuesta == 'alto_bajo':
-                if seleccion == 'alto':
-                    gano = (18 < numero_salido <= 36)
-                elif seleccion == 'bajo':
-                    gano = (1 <= numero_salido <= 18)
-
-            # Actualizar ganancias/pérdidas según resultado
+        'apuesta_actual': apuesta_base,
+        'victorias_consecutivas': 0,
+        'fib_index': 0,
+        # Contadores de victorias/derrotas
+        'conteo': 0,
+        'conteo_victorias': 0,
+        'conteo_derrotas': 0,
+        # Registros acumulados por tirada
+        'capital_acum': [],
+        'ganancias_perdidas_acum': [],
+        'victorias': bytearray(),  # 1 si ganó la tirada, 0 si perdió (solo con selección)
+    }
+
+
+def _jugar_tiradas(estado, tiradas, desfase, n_tiradas, gana, pago, estrategia, capital_tipo, seleccion,
+                   perfil=None, guardar=None, cada=0, faltan_foto=0, apuesta_base=APUESTA_BASE, fibonacci=FIBONACCI,
+                   reinicio_paroli=REINICIO_PAROLI, limite_mesa=None):
+    """
+    Juega las tiradas estado['i']..n_tiradas de una corrida, actualizando `estado`.
+
+    tiradas[j] es el número salido en la tirada desfase + j + 1. Si se pasa
+    `guardar`, se llama con el estado parcial cuando pasan `faltan_foto`
+    tiradas y después cada `cada` tiradas (para checkpoints); devuelve cuántas
+    faltan para el próximo. apuesta_base, fibonacci, reinicio_paroli y
+    limite_mesa son las reglas de las estrategias (ver simular_ruleta).
+    """
+    # Copiamos el estado a variables locales: el bucle corre mucho más rápido así
+    capital = estado['capital']
+    ganancias_perdidas = estado['ganancias_perdidas']
+    apuesta_actual = estado['apuesta_actual']
+    victorias_consecutivas = estado['victorias_consecutivas']
+    fib_index = estado['fib_index']
+    conteo = estado['conteo']
+    conteo_victorias = estado['conteo_victorias']
+    conteo_derrotas = estado['conteo_derrotas']
+    capital_acum = estado['capital_acum']
+    ganancias_perdidas_acum = estado['ganancias_perdidas_acum']
+    registro_victorias = estado['victorias']
+    en_bancarrota = estado['en_bancarrota']
+
+    i_inicio = estado['i']
+    # Tirada en la que toca el próximo checkpoint (0 nunca coincide)
+    i_foto = i_inicio + faltan_foto if guardar is not None else 0
+
+    i = i_inicio
+    for i in range(i_inicio, n_tiradas + 1):
+        if i == i_foto:
+            estado.update(i=i, capital=capital, ganancias_perdidas=ganancias_perdidas,
+                          apuesta_actual=apuesta_actual, victorias_consecutivas=victorias_consecutivas,
+                          fib_index=fib_index, conteo=conteo, conteo_victorias=conteo_victorias,
+                          conteo_derrotas=conteo_derrotas)
+            guardar(estado)
+            i_foto += cada
+
+        if capital_tipo == 'f' and capital <= 0:
+            en_bancarrota = True
+            break
+
+        if limite_mesa is not None and apuesta_actual > limite_mesa:
+            apuesta_actual = limite_mesa  # La mesa no acepta apuestas más grandes
+
+        if capital_tipo == 'f' and apuesta_actual > capital:
+            apuesta_actual = capital  # No apostar más del capital disponible
+
+        # Determinar si ganó la apuesta
+        numero_salido = tiradas[i - 1 - desfase]
+        gano = gana[numero_salido]
+        if perfil is not None:
+            perfil.marcar('resolucion')
+
+        # Actualizar ganancias/pérdidas según resultado
+        if gano:
+            ganancias_perdidas += apuesta_actual * pago
+        else:
+            ganancias_perdidas -= apuesta_actual
+
+        # Actualizar capital según tipo
+        if capital_tipo == 'f':
             if gano:
-                ganancias_perdidas += apuesta_actual * pago
+                capital += apuesta_actual * pago
             else:
-                ganancias_perdidas -= apuesta_actual
-
-            # Actualizar capital según tipo
-            if capital_tipo == 'f':
-                if gano:
-                    capital += apuesta_actual * pago
-                else:
-                    capital -= apuesta_actual
+                capital -= apuesta_actual
+        else:
+            capital = float('inf')  # Mantener como infinito
+
+        # Registrar ambos valores
+        capital_acum.append(capital)
+        ganancias_perdidas_acum.append(ganancias_perdidas)
+        if perfil is not None:
+            perfil.marcar('estadisticas')
+
+        # Actualizar apuesta según estrategia
+        if estrategia == 'm':  # Martingala
+            apuesta_actual = apuesta_base if gano else apuesta_actual * 2
+        elif estrategia == 'd':  # D'Alembert
+            apuesta_actual = max(apuesta_base, apuesta_actual + (apuesta_base if not gano else -apuesta_base))
+        elif estrategia == 'f':  # Fibonacci
+            if gano:
+                fib_index = max(0, fib_index - 2)  # Retrocede 2 posiciones si gana
             else:
-                capital = float('inf')  # Mantener como infinito
-
-            # Registrar ambos valores
-            capital_acum.append(capital)
-            ganancias_perdidas_acum.append(ganancias_perdidas)
-
-            # Actualizar apuesta según estrategia
-            if estrategia == 'm':  # Martingala
-                apuesta_actual = apuesta_base if gano else apuesta_actual * 2
-            elif estrategia == 'd':  # D'Alembert
-                apuesta_actual = max(apuesta_base, apuesta_actual + (apuesta_base if not gano else -apuesta_base))
-            elif estrategia == 'f':  # Fibonacci
-                if gano:
-                    fib_index = max(0, fib_index - 2)  # Retrocede 2 posiciones si gana
-                else:
-                    fib_index = min(len(fibonacci) - 1, fib_index + 1)  # Avanza 1 posición si pierde
-                apuesta_actual = apuesta_base * fibonacci[fib_index]
-            elif estrategia == 'o':  # Paroli
-                if gano and victorias_consecutivas < 3:
-                    apuesta_actual *= 2  # Duplica la apuesta si gana y no ha alcanzado 3 victorias consecutivas
-                else:
-                    apuesta_actual = apuesta_base  # Reinicia la apuesta
-            elif estrategia == 'p':  # Pleno (apuesta fija)
-                apuesta_actual = apuesta_base  # Siempre la misma apuesta
-
-            # Estadísticas (solo si se especificó una selección)
-            if seleccion is not None:
-                if gano:
-                    conteo += 1
-                    conteo_victorias += 1
-                    victorias_consecutivas += 1
-                else:
-                    conteo_derrotas += 1
-                    victorias_consecutivas = 0
-                
-                fr = conteo / i
-                fr_acum.append(fr)
-                victorias_acum.append(conteo)
-                # Relación victorias/derrotas
-                ratio = conteo_victorias / conteo_derrotas if conteo_derrotas > 0 else np.nan
-                win_loss_acum.append(ratio)
+                fib_index = min(len(fibonacci) - 1, fib_index + 1)  # Avanza 1 posición si pierde
+            apuesta_actual = apuesta_base * fibonacci[fib_index]
+        elif estrategia == 'o':  # Paroli
+            if gano and victorias_consecutivas < reinicio_paroli:
+                apuesta_actual *= 2  # Duplica la apuesta si gana y no ha alcanzado reinicio_paroli victorias consecutivas
             else:
-                fr_acum.append(np.nan)
-                victorias_acum.append(0)
-                win_loss_acum.append(np.nan)
-
-        # Rellenar las listas hasta n_tiradas si la simulación terminó antes
-        while len(capital_acum) < n_tiradas:
-            capital_acum.append(capital_acum[-1] if capital_acum else np.nan)
-            ganancias_perdidas_acum.append(ganancias_perdidas_acum[-1] if ganancias_perdidas_acum else 0)
-            if seleccion is not None:
-                fr_acum.append(fr_acum[-1] if fr_acum else np.nan)
-                victorias_acum.append(victorias_acum[-1] if victorias_acum else 0)
-                win_loss_acum.append(win_loss_acum[-1] if win_loss_acum else np.nan)
+                apuesta_actual = apuesta_base  # Reinicia la apuesta
+        elif estrategia == 'p':  # Pleno (apuesta fija)
+            apuesta_actual = apuesta_base  # Siempre la misma apuesta
+        if perfil is not None:
+            perfil.marcar('estrategia')
+
+        # Estadísticas (solo si se especificó una selección)
+        if seleccion is not None:
+            if gano:
+                conteo += 1
+                conteo_victorias += 1
+                victorias_consecutivas += 1
             else:
-                fr_acum.append(np.nan)
-                victorias_acum.append(0)
-                win_loss_acum.append(np.nan)
+                conteo_derrotas += 1
+                victorias_consecutivas = 0
+            # Frecuencia, victorias acumuladas y relación victorias/derrotas salen de este registro
+            registro_victorias.append(gano)
+        if perfil is not None:
+            perfil.marcar('estadisticas')
+    else:
+        i = n_tiradas + 1
+        # La bancarrota se mira al empezar cada tirada; si fue en la última, la marcamos acá
+        if capital_tipo == 'f' and capital <= 0:
+            en_bancarrota = True
+
+    if perfil is not None:
+        perfil.contar('tiradas', i - i_inicio)
+
+    estado.update(i=i, capital=capital, ganancias_perdidas=ganancias_perdidas, en_bancarrota=en_bancarrota,
+                  apuesta_actual=apuesta_actual, victorias_consecutivas=victorias_consecutivas,
+                  fib_index=fib_index, conteo=conteo, conteo_victorias=conteo_victorias,
+                  conteo_derrotas=conteo_derrotas)
+    return i_foto - i if guardar is not None else faltan_foto
+
+
+def _rellenar_corrida(estado, n_tiradas):
+    """
+    Repite el último valor de capital y ganancias hasta n_tiradas (corridas
+    que terminaron en bancarrota). Las series derivadas de las victorias se
+    rellenan solas al calcularlas (ver victorias.serie).
+    """
+    capital_acum = estado['capital_acum']
+    ganancias_perdidas_acum = estado['ganancias_perdidas_acum']
 
-        resultados['frecuencias'].append(fr_acum)
+    # Rellenar las listas hasta n_tiradas si la simulación terminó antes
+    while len(capital_acum) < n_tiradas:
+        capital_acum.append(capital_acum[-1] if capital_acum else np.nan)
+        ganancias_perdidas_acum.append(ganancias_perdidas_acum[-1] if ganancias_perdidas_acum else 0)
+
+
+def _cerrar_corrida(resultados, estado, n_tiradas, capital_tipo, capital_inicial, perfil=None,
+                    guardar_curvas=True):
+    """
+    Rellena los registros de una corrida terminada y los agrega a los
+    resultados. Con guardar_curvas=False las curvas por tirada solo se guardan
+    si es la primera corrida; las demás solo aportan valores finales y bandas
+    (y su estado final no se guarda, porque sin curvas no se pueden extender).
+    """
+    _rellenar_corrida(estado, n_tiradas)
+    if perfil is not None:
+        perfil.marcar('relleno')
+
+    capital_acum = estado['capital_acum']
+    ganancias_perdidas_acum = estado['ganancias_perdidas_acum']
+    if guardar_curvas or not resultados['capital_final']:
         resultados['capital'].append(capital_acum)
         resultados['ganancias_perdidas'].append(ganancias_perdidas_acum)
-        resultados['victorias_acumuladas'].append(victorias_acum)
-        resultados['win_loss_ratio'].append(win_loss_acum)
-        resultados['capital_final'].append(capital_acum[-1] if capital_acum else np.nan)
-        resultados['ganancia_neta'].append((capital_acum[-1] - capital_inicial) if capital_tipo == 'f' else ganancias_perdidas_acum[-1])
-        if en_bancarrota:
-            resultados['bancarrotas'] += 1
+        resultados['victorias_bits'].append(empaquetar(estado['victorias']))
+        resultados['jugadas'].append(len(estado['victorias']))
+    resultados['capital_final'].append(capital_acum[-1] if capital_acum else np.nan)
+    resultados['ganancia_neta'].append((capital_acum[-1] - capital_inicial) if capital_tipo == 'f' else ganancias_perdidas_acum[-1])
+    resultados['bandas'].actualizar(ganancias_perdidas_acum if capital_tipo == 'i' else capital_acum)
+    if estado['en_bancarrota']:
+        resultados['bancarrotas'] += 1
+    if guardar_curvas:
+        # Los registros ya quedaron en resultados; del estado guardamos solo los escalares (para extender_tiradas)
+        resultados['estados_finales'].append({clave: valor for clave, valor in estado.items()
+                                              if not isinstance(valor, (list, bytearray))})
+    if perfil is not None:
+        perfil.marcar('estadisticas')
+
+
+def extender_tiradas(datos, tiradas_extra, checkpoint=None):
+    """
+    Agrega tiradas a todas las corridas de una simulación terminada, sin
+    recalcular las ya jugadas.
 
-    return resultados
+    Cada corrida sigue desde su estado final (capital, apuesta, índice de
+    Fibonacci, rachas, etc.). Las tiradas nuevas salen de un generador propio
+    por corrida, derivado del estado final de random del checkpoint, así que
+    extender es reproducible, pero no da lo mismo que haber simulado las
+    n_tiradas + tiradas_extra de entrada.
+
+    Args:
+        datos: Checkpoint completo (ver cargar_simulacion)
+        tiradas_extra: Tiradas a agregar en cada corrida
+        checkpoint: Archivo donde guardar el checkpoint extendido (opcional)
+    """
+    if not datos['completo']:
+        raise ValueError("Solo se puede extender una simulación terminada; reanudala primero con --resume")
+    if not datos['parametros']['guardar_curvas']:
+        # Las bandas tienen una columna por tirada y se rearman desde las curvas de todas las corridas
+        raise ValueError("Para extender tiradas la simulación tiene que haberse guardado con --guardar_curvas")
+
+    parametros = dict(datos['parametros'])
+    resultados = datos['resultados']
+    n_previo = parametros['n_tiradas']
+    n_tiradas = n_previo + tiradas_extra
+    seleccion = parametros['seleccion']
+    capital_tipo = parametros['capital_tipo']
+    capital_inicial = parametros['capital_inicial']
+    gana, _, pago = tabla_apuesta(parametros['tipo_apuesta'], seleccion)
+    huella = hashlib.sha256(repr(datos['rng']).encode()).hexdigest()
+    numeros_ruleta = list(range(37))
+
+    for corrida, estado_final in enumerate(resultados['estados_finales']):
+        estado = dict(estado_final,
+                      capital_acum=resultados['capital'][corrida],
+                      ganancias_perdidas_acum=resultados['ganancias_perdidas'][corrida],
+                      victorias=desempaquetar(resultados['victorias_bits'][corrida], resultados['jugadas'][corrida]))
+        if not estado['en_bancarrota']:
+            rng = random.Random(f'{huella}:{corrida}:{n_previo}')
+            tiradas = [rng.choice(numeros_ruleta) for _ in range(tiradas_extra)]
+            _jugar_tiradas(estado, tiradas, n_previo, n_tiradas, gana, pago, parametros['estrategia'],
+                           capital_tipo, seleccion, apuesta_base=parametros['apuesta_base'],
+                           fibonacci=parametros['fibonacci'], reinicio_paroli=parametros['reinicio_paroli'],
+                           limite_mesa=parametros['limite_mesa'])
+            if estado['en_bancarrota']:
+                resultados['bancarrotas'] += 1
+        _rellenar_corrida(estado, n_tiradas)
+
+        capital_acum = estado['capital_acum']
+        ganancias_perdidas_acum = estado['ganancias_perdidas_acum']
+        resultados['victorias_bits'][corrida] = empaquetar(estado['victorias'])
+        resultados['jugadas'][corrida] = len(estado['victorias'])
+        resultados['capital_final'][corrida] = capital_acum[-1] if capital_acum else np.nan
+        resultados['ganancia_neta'][corrida] = (capital_acum[-1] - capital_inicial) if capital_tipo == 'f' else ganancias_perdidas_acum[-1]
+        resultados['estados_finales'][corrida] = {clave: valor for clave, valor in estado.items()
+                                                  if not isinstance(valor, (list, bytearray))}
+
+    # Las bandas tienen una columna por tirada: se rearman con el nuevo largo
+    resultados['bandas'] = SketchCuantiles(n_tiradas)
+    for curva in (resultados['ganancias_perdidas'] if capital_tipo == 'i' else resultados['capital']):
+        resultados['bandas'].actualizar(curva)
+
+    parametros['n_tiradas'] = n_tiradas
+    if checkpoint is not None:
+        reescribir_curvas(checkpoint, [_registro_curvas(resultados, corrida)
+                                       for corrida in range(len(resultados['capital']))])
+        guardar_bandas(checkpoint, resultados['bandas'])
+        guardar_checkpoint(checkpoint, dict(datos, parametros=parametros, resultados=_resultados_livianos(resultados)))
+    return resultados, parametros
+
+
+def resumir_lote(n_corridas, **parametros):
+    """
+    Simula un lote de corridas y devuelve su resumen parcial para el modo
+    progresivo (ver utilidades.progresivo): ganancia neta y bancarrotas por
+    corrida, y las curvas de capital (o ganancias) y frecuencia relativa.
+    """
+    resultados = simular_ruleta(n_tiradas=parametros['n_tiradas'], n_corridas=n_corridas,
+                                **{k: v for k, v in parametros.items() if k != 'n_tiradas'})
+    escalares = {'ganancia_neta': resultados['ganancia_neta']}
+    if parametros['capital_tipo'] == 'f':
+        # Indicadora de bancarrota: su media es la probabilidad de ruina
+        escalares['bancarrota'] = [1] * resultados['bancarrotas'] + [0] * (n_corridas - resultados['bancarrotas'])
+        curvas = {'capital': resultados['capital']}
+    else:
+        curvas = {'ganancias_perdidas': resultados['ganancias_perdidas']}
+    if parametros['seleccion'] is not None:
+        curvas['frecuencias'] = resultados['frecuencias']
+    return progresivo.resumen_lote(escalares, curvas)
 
 
 def graficar_resultados(resultados, n_tiradas, n_corridas, estrategia, capital_tipo, capital_inicial=1000):
@@ -333,27 +587,29 @@ def graficar_resultados(resultados, n_tiradas, n_corridas, estrategia, capital_t
         plt.grid(True)
         plt.show()
 
-    # 5. Gráfico de ganancias/pérdidas o capital promedio
-    if resultados.get('ganancias_perdidas'):
+    # 5. Bandas de cuantiles de ganancias/pérdidas o capital (todas las corridas)
+    # Media ± desvío engaña con resultados de cola pesada (Martingala), así que se
+    # grafican la mediana y las bandas p5-p95 y p1-p99 de un sketch en streaming.
+    bandas = resultados.get('bandas')
+    if bandas is None and resultados.get('ganancias_perdidas'):
         datos = resultados['ganancias_perdidas'] if capital_tipo == 'i' else resultados['capital']
-        max_len = max(len(cap) for cap in datos)
-        padded_data = [cap + [np.nan] * (max_len - len(cap)) for cap in datos]
-        
-        promedio = np.nanmean(padded_data, axis=0)
-        std = np.nanstd(padded_data, axis=0)
+        bandas = SketchCuantiles(len(datos[0]))
+        for curva in datos:
+            bandas.actualizar(curva)
+    if bandas is not None and bandas.n > 0:
+        p1, p5, p50, p95, p99 = bandas.cuantiles(CUANTILES_BANDAS)
         
         plt.figure(figsize=figsize)
         
-        y_label = 'Ganancias/Pérdidas Promedio' if capital_tipo == 'i' else 'Capital promedio'
+        y_label = 'Ganancias/Pérdidas' if capital_tipo == 'i' else 'Capital'
         referencia = 0  # Siempre comparamos con el punto de equilibrio
+        x_bandas = x_vals[:len(p50)]
         
-        plt.plot(x_vals[:len(promedio)], promedio, label=y_label, color='orange')
-        plt.fill_between(x_vals[:len(promedio)], 
-                        promedio - std, 
-                        promedio + std, 
-                        color='orange', alpha=0.2, label='±1 Desviación estándar')
+        plt.fill_between(x_bandas, p1, p99, color='orange', alpha=0.15, label='p1 - p99')
+        plt.fill_between(x_bandas, p5, p95, color='orange', alpha=0.35, label='p5 - p95')
+        plt.plot(x_bandas, p50, label=f'{y_label} (mediana)', color='orange')
         plt.axhline(y=referencia, color='blue', linestyle='--', label='Punto de equilibrio')
-        plt.title(f'{y_label} ({n_corridas} corridas)')
+        plt.title(f'{y_label}: mediana y bandas de cuantiles ({n_corridas} corridas)')
         plt.xlabel('Número de tiradas')
         plt.ylabel(y_label)
         plt.legend()
@@ -436,8 +692,73 @@ def main():
                        choices=['numero', 'color', 'docena', 'columna', 'par_impar', 'alto_bajo'],
                        default=None,
                        help='Tipo de apuesta: numero, color, docena, columna, par_impar, alto_bajo (opcional)')
+    parser.add_argument('--semilla', type=int, default=None,
+                       help='Semilla de random para que la simulación sea reproducible (opcional)')
+    parser.add_argument('--todas', action='store_true',
+                       help='Evalúa todas las apuestas (números, colores, docenas, columnas, par/impar, alto/bajo) sobre las mismas tiradas (opcional)')
+    parser.add_argument('--importancia', action='store_true',
+                       help='Estima la probabilidad de ruina y la cola de pérdidas con muestreo por importancia; necesita -a f (opcional)')
+    parser.add_argument('--prob_victoria_is', type=float, default=None,
+                       help='Probabilidad de ganar bajo la distribución inclinada de --importancia (opcional, default=elegida con una corrida piloto)')
+    
+    # Checkpoints para corridas largas
+    parser.add_argument('--checkpoint', default=None,
+                       help='Archivo donde guardar periódicamente el estado de la simulación (opcional)')
+    parser.add_argument('--checkpoint_cada', type=int, default=100000,
+                       help='Tiradas jugadas entre checkpoints (opcional, default=100000)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Continúa la simulación guardada en --checkpoint; los parámetros salen del archivo (opcional)')
+    parser.add_argument('--extender_corridas', type=int, default=0,
+                       help='Agrega esta cantidad de corridas a la simulación guardada en --checkpoint (opcional)')
+    parser.add_argument('--extender_tiradas', type=int, default=0,
+                       help='Agrega esta cantidad de tiradas a cada corrida de la simulación guardada en --checkpoint; necesita --guardar_curvas (opcional)')
+    parser.add_argument('--guardar_curvas', action='store_true',
+                       help='Guarda las curvas por tirada de todas las corridas y no solo de la primera; usa memoria proporcional a -c (opcional)')
+    # Reglas de las estrategias (ver optimizacion.py para buscar las mejores)
+    parser.add_argument('--apuesta_base', type=int, default=APUESTA_BASE,
+                       help=f'Apuesta inicial de todas las estrategias (opcional, default={APUESTA_BASE})')
+    parser.add_argument('--fibonacci', default=None,
+                       help='Tabla de Fibonacci separada por comas, ej: 1,1,2,3,5 (opcional, default=' + ','.join(map(str, FIBONACCI)) + ')')
+    parser.add_argument('--reinicio_paroli', type=int, default=REINICIO_PAROLI,
+                       help=f'Victorias seguidas tras las que Paroli vuelve a la apuesta base (opcional, default={REINICIO_PAROLI})')
+    parser.add_argument('--limite_mesa', type=int, default=None,
+                       help='Apuesta máxima que acepta la mesa (opcional, default=sin límite)')
+    progresivo.agregar_argumentos(parser)
+    distribuido.agregar_argumentos(parser)
+    parser.add_argument('--estrategias', default=None,
+                       help='Estrategias a barrer en modo distribuido, todas sobre las mismas tiradas (ej: mdfop) (opcional, default=-s)')
+    perfilado.agregar_argumentos(parser)
     
     args = parser.parse_args()
+    continuar = args.resume or args.extender_corridas > 0 or args.extender_tiradas > 0
+    if continuar and args.checkpoint is None:
+        parser.error('--resume, --extender_corridas y --extender_tiradas necesitan --checkpoint')
+    if args.progresivo and (args.checkpoint is not None or args.todas or args.importancia):
+        parser.error('--progresivo no se puede combinar con --checkpoint, --todas ni --importancia')
+    if args.distribuido and (args.progresivo or args.checkpoint is not None or args.todas or args.importancia):
+        parser.error('--distribuido no se puede combinar con --progresivo, --checkpoint, --todas ni --importancia')
+    if args.estrategias is not None and set(args.estrategias) - set('mdfop'):
+        parser.error('--estrategias solo admite las letras m, d, f, o y p')
+    if args.importancia and args.a != 'f':
+        parser.error('--importancia necesita capital finito (-a f): con capital infinito no hay ruina')
+    try:
+        fibonacci = [int(x) for x in args.fibonacci.split(',')] if args.fibonacci else FIBONACCI
+    except ValueError:
+        parser.error('--fibonacci tiene que ser una lista de enteros separados por comas')
+    reglas = {'apuesta_base': args.apuesta_base, 'fibonacci': fibonacci,
+              'reinicio_paroli': args.reinicio_paroli, 'limite_mesa': args.limite_mesa}
+    perfil = perfilado.crear_perfilador(args, 'TP_1.2 simulacion1.2')
+    if args.semilla is not None:
+        random.seed(args.semilla)
+
+    if args.todas:
+        # Todas las apuestas en una sola pasada; -e y --tipo_apuesta no se usan
+        tabla = simular_todas_las_apuestas(args.n, args.c, estrategia=args.s, capital_tipo=args.a,
+                                           capital_inicial=args.capital_inicial, reglas=reglas)
+        with perfilado.medir_fase(perfil, 'graficado', excluir_show=True):
+            mostrar_todas_las_apuestas(tabla, args.c, args.s, args.a)
+        perfilado.cerrar_perfilador(perfil, args)
+        return
 
     # Convertir selección a tipo apropiado
     seleccion = args.e
@@ -452,44 +773,110 @@ def main():
     # Determinar automáticamente el tipo de apuesta si no se especifica
     tipo_apuesta = args.tipo_apuesta
     if tipo_apuesta is None and seleccion is not None:
-        if isinstance(seleccion, int):
-            if 0 <= seleccion <= 36:
-                tipo_apuesta = 'numero'
-            elif 1 <= seleccion <= 3:
-                tipo_apuesta = random.choice(['docena', 'columna'])
-        elif isinstance(seleccion, str):
-            if seleccion in ['rojo', 'negro']:
-                tipo_apuesta = 'color'
-            elif seleccion in ['par', 'impar']:
-                tipo_apuesta = 'par_impar'
-            elif seleccion in ['alto', 'bajo']:
-                tipo_apuesta = 'alto_bajo'
+        tipo_apuesta = deducir_tipo_apuesta(seleccion)
     
     # Si aún no se determinó, usar número como default
     if tipo_apuesta is None:
         tipo_apuesta = 'numero'
         seleccion = random.randint(0, 36)  # Seleccionar un número aleatorio
+    # Validar acá y no recién en simular_ruleta: en los modos progresivo y distribuido fallaría en otro proceso
+    try:
+        validar_seleccion(tipo_apuesta, seleccion)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.importancia:
+        # Ruina y cola de pérdidas con tiradas de una distribución inclinada
+        with perfilado.medir_fase(perfil, 'muestreo_importancia'):
+            reporte = simular_importancia(args.n, args.c, seleccion, tipo_apuesta, estrategia=args.s,
+                                          capital_inicial=args.capital_inicial,
+                                          prob_victoria_is=args.prob_victoria_is, semilla=args.semilla,
+                                          reglas=reglas)
+        mostrar_importancia(reporte, args.s, args.capital_inicial)
+        perfilado.cerrar_perfilador(perfil, args)
+        return
+
+    if args.progresivo:
+        # La simulación corre en otro proceso; acá se muestran los resultados parciales
+        parametros = {'n_tiradas': args.n, 'seleccion': seleccion, 'estrategia': args.s, 'capital_tipo': args.a,
+                      'capital_inicial': args.capital_inicial, 'tipo_apuesta': tipo_apuesta, **reglas}
+        _, prob_teorica, _ = tabla_apuesta(tipo_apuesta, seleccion)
+        vista = progresivo.VistaProgresiva(f'Estrategia {args.s.upper()} - {tipo_apuesta} {seleccion}', args.c,
+                                           referencias={'frecuencias': prob_teorica,
+                                                        'capital': args.capital_inicial, 'ganancias_perdidas': 0})
+        with perfilado.medir_fase(perfil, 'simulacion_progresiva', excluir_show=True):
+            progresivo.ejecutar_progresivo('ruleta12', 'resumir_lote', parametros, args.c, vista,
+                                           intervalo=args.intervalo)
+        perfilado.cerrar_perfilador(perfil, args)
+        return
+
+    if args.distribuido:
+        # Un conjunto de parámetros por estrategia; cada corrida tiene su propia subsecuencia de random
+        semilla = args.semilla if args.semilla is not None else random.randrange(2**32)
+        conjuntos = [(f'Estrategia {e.upper()}', {'n_tiradas': args.n, 'seleccion': seleccion, 'estrategia': e,
+                                                   'capital_tipo': args.a, 'capital_inicial': args.capital_inicial,
+                                                   'tipo_apuesta': tipo_apuesta, **reglas})
+                     for e in (args.estrategias or args.s)]
+        with perfilado.medir_fase(perfil, 'simulacion_distribuida'):
+            resumenes = distribuido.ejecutar_distribuido(
+                'ruleta12', 'resumir_lote', conjuntos, args.c, semilla, tam_shard=args.tam_shard,
+                host=args.host, puerto=args.puerto, clave=args.clave,
+                trabajadores_locales=args.trabajadores_locales, plazo=args.plazo)
+        distribuido.mostrar_resumenes(resumenes, f'{tipo_apuesta} {seleccion} - {args.c} corridas de {args.n} tiradas '
+                                                 f'(semilla {semilla})')
+        perfilado.cerrar_perfilador(perfil, args)
+        return
+
+    if continuar:
+        # Los parámetros salen del checkpoint; los de la línea de comandos se ignoran
+        datos = cargar_simulacion(args.checkpoint)
+        parametros = dict(datos['parametros'])
+        parametros['n_corridas'] += args.extender_corridas
+        if args.extender_tiradas > 0 and not parametros['guardar_curvas']:
+            parser.error('--extender_tiradas necesita una simulación guardada con --guardar_curvas')
+    else:
+        datos = None
+        parametros = {
+            'n_tiradas': args.n,
+            'n_corridas': args.c,
+            'seleccion': seleccion,
+            'estrategia': args.s,
+            'capital_tipo': args.a,
+            'capital_inicial': args.capital_inicial,
+            'tipo_apuesta': tipo_apuesta,
+            **reglas,
+            # Los gráficos solo usan las curvas de la primera corrida
+            'guardar_curvas': args.guardar_curvas
+        }
 
     # Ejecutar simulación
+    inicio = time.perf_counter()
     resultados = simular_ruleta(
-        n_tiradas=args.n,
-        n_corridas=args.c,
-        seleccion=seleccion,
-        estrategia=args.s,
-        capital_tipo=args.a,
-        capital_inicial=args.capital_inicial,
-        tipo_apuesta=tipo_apuesta
+        **parametros,
+        perfil=perfil,
+        checkpoint=args.checkpoint,
+        checkpoint_cada=args.checkpoint_cada,
+        reanudar_desde=datos
     )
+    if args.extender_tiradas > 0:
+        resultados, parametros = extender_tiradas(cargar_simulacion(args.checkpoint), args.extender_tiradas,
+                                                  checkpoint=args.checkpoint)
+    if perfil is not None:
+        # Tiradas realmente jugadas (sin contar el relleno tras una bancarrota) por segundo
+        perfil.metricas['tiradas_por_seg'] = {parametros['estrategia']: perfil.contadores.get('tiradas', 0) / (time.perf_counter() - inicio)}
 
     # Generar gráficos
-    graficar_resultados(
-        resultados=resultados,
-        n_tiradas=args.n,
-        n_corridas=args.c,
-        estrategia=args.s,
-        capital_tipo=args.a,
-        capital_inicial=args.capital_inicial
-    )
+    with perfilado.medir_fase(perfil, 'graficado', excluir_show=True):
+        graficar_resultados(
+            resultados=resultados,
+            n_tiradas=parametros['n_tiradas'],
+            n_corridas=parametros['n_corridas'],
+            estrategia=parametros['estrategia'],
+            capital_tipo=parametros['capital_tipo'],
+            capital_inicial=parametros['capital_inicial']
+        )
+
+    perfilado.cerrar_perfilador(perfil, args)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,183 @@
+import random
+import numpy as np
+import matplotlib.pyplot as plt
+
+from apuestas import APUESTA_BASE, FIBONACCI, REINICIO_PAROLI, SELECCIONES, matriz_pagos
+
+
+def generar_tiradas(n_tiradas, n_corridas):
+    """
+    Genera las tiradas de todas las corridas, en el mismo orden en que las
+    consume simular_ruleta (con la misma semilla salen las mismas tiradas).
+    """
+    numeros_ruleta = list(range(37))
+    tiradas = np.empty((n_corridas, n_tiradas), dtype=np.uint8)
+    for corrida in range(n_corridas):
+        tiradas[corrida] = [random.choice(numeros_ruleta) for _ in range(n_tiradas)]
+    return tiradas
+
+
+def simular_vectorizado(tiradas, gana, pagos, estrategia='m', capital_tipo='i', capital_inicial=1000,
+                        apuesta_base=APUESTA_BASE, fibonacci=FIBONACCI, reinicio_paroli=REINICIO_PAROLI,
+                        limite_mesa=None):
+    """
+    Juega varias apuestas sobre las mismas tiradas, en todas las corridas a la vez.
+
+    Sigue la misma lógica tirada a tirada que simular_ruleta (bancarrota,
+    tope de apuesta, estrategias), pero el estado es una matriz
+    (apuestas x corridas) y cada tirada se resuelve con una sola indexación
+    de la matriz de pagos. Los montos son float64: con Martingala y capital
+    infinito, después de ~50 derrotas seguidas dejan de ser exactos.
+
+    Args:
+        tiradas: Matriz (n_corridas, n_tiradas) con los números salidos
+        gana: Matriz booleana (n_apuestas, 37), ver apuestas.matriz_pagos
+        pagos: Pago de cada apuesta (n_apuestas,)
+        estrategia, capital_tipo, capital_inicial: Como en simular_ruleta
+        apuesta_base, reinicio_paroli, limite_mesa: Como en simular_ruleta; cada uno
+            puede ser un valor o un array (n_apuestas,) con uno por fila, así una
+            misma pasada evalúa varias configuraciones (ver optimizacion.py)
+        fibonacci: Tabla de multiplicadores de Fibonacci, común a todas las filas
+
+    Returns:
+        Diccionario de matrices (n_apuestas, n_corridas): 'ganancia_neta',
+        'capital_final', 'victorias', 'derrotas', 'jugadas' y 'bancarrota'
+    """
+    n_corridas, n_tiradas = tiradas.shape
+    forma = (gana.shape[0], n_corridas)
+    finito = capital_tipo == 'f'
+    # Reglas como columnas (filas x 1) para que se extiendan sobre las corridas
+    base = np.asarray(apuesta_base, dtype=np.float64).reshape(-1, 1)
+    reinicio = np.asarray(reinicio_paroli).reshape(-1, 1)
+    limite = None if limite_mesa is None else np.asarray(limite_mesa, dtype=np.float64).reshape(-1, 1)
+    fibonacci = np.array(fibonacci, dtype=np.float64)
+    pagos = np.asarray(pagos, dtype=np.float64)[:, None]
+
+    apuesta = np.full(forma, base)
+    capital = np.full(forma, float(capital_inicial))
+    ganancias = np.zeros(forma)
+    victorias = np.zeros(forma, dtype=np.int64)
+    jugadas = np.zeros(forma, dtype=np.int64)
+    victorias_consecutivas = np.zeros(forma, dtype=np.int64)
+    fib_index = np.zeros(forma, dtype=np.intp)
+    activo = np.ones(forma, dtype=bool)
+
+    for t in range(n_tiradas):
+        if limite is not None:
+            np.minimum(apuesta, limite, out=apuesta)  # La mesa no acepta apuestas más grandes
+        if finito:
+            # Bancarrota: la corrida deja de jugar (igual que el break de simular_ruleta)
+            activo &= capital > 0
+            if not activo.any():
+                break
+            np.minimum(apuesta, capital, out=apuesta)  # No apostar más del capital disponible
+
+        # Resolver todas las apuestas de todas las corridas de una vez
+        gano = gana[:, tiradas[:, t]]
+
+        delta = np.where(gano, apuesta * pagos, -apuesta)
+        if finito:
+            delta *= activo
+            capital += delta
+        ganancias += delta
+
+        # Actualizar apuesta según estrategia
+        if estrategia == 'm':  # Martingala
+            nueva = np.where(gano, base, apuesta * 2)
+        elif estrategia == 'd':  # D'Alembert
+            nueva = np.maximum(base, apuesta + np.where(gano, -base, base))
+        elif estrategia == 'f':  # Fibonacci
+            nuevo_index = np.where(gano, np.maximum(0, fib_index - 2),
+                                   np.minimum(len(fibonacci) - 1, fib_index + 1))
+            fib_index = np.where(activo, nuevo_index, fib_index)
+            nueva = base * fibonacci[fib_index]
+        elif estrategia == 'o':  # Paroli
+            nueva = np.where(gano & (victorias_consecutivas < reinicio), apuesta * 2, base)
+        else:  # Pleno (apuesta fija)
+            nueva = np.full(forma, base)
+
+        if finito:
+            apuesta = np.where(activo, nueva, apuesta)
+            gano &= activo
+            jugadas += activo
+            victorias_consecutivas = np.where(activo, np.where(gano, victorias_consecutivas + 1, 0),
+                                              victorias_consecutivas)
+        else:
+            apuesta = nueva
+            jugadas += 1
+            victorias_consecutivas = np.where(gano, victorias_consecutivas + 1, 0)
+        victorias += gano
+
+    return {
+        'ganancia_neta': capital - capital_inicial if finito else ganancias,
+        'capital_final': capital if finito else np.full(forma, np.inf),
+        'victorias': victorias,
+        'derrotas': jugadas - victorias,
+        'jugadas': jugadas,
+        # Terminó sin capital, aunque haya sido en la última tirada (igual que simular_ruleta)
+        'bancarrota': capital <= 0 if finito else np.zeros(forma, dtype=bool),
+    }
+
+
+def simular_todas_las_apuestas(n_tiradas, n_corridas, estrategia='m', capital_tipo='i', capital_inicial=1000,
+                               selecciones=SELECCIONES, reglas=None):
+    """
+    Evalúa todas las apuestas (37 números, colores, docenas, columnas,
+    par/impar y alto/bajo) contra las mismas tiradas, en una sola pasada.
+    `reglas` son apuesta_base, fibonacci, reinicio_paroli y limite_mesa (ver
+    simular_ruleta); si no se pasan se usan las de siempre.
+
+    Returns:
+        Lista de diccionarios, uno por apuesta, con la frecuencia relativa de
+        victorias, la relación victorias/derrotas y la ganancia neta
+        (promedios sobre las corridas), y la cantidad de bancarrotas.
+    """
+    gana, pagos, probs = matriz_pagos(selecciones)
+    tiradas = generar_tiradas(n_tiradas, n_corridas)
+    res = simular_vectorizado(tiradas, gana, pagos, estrategia, capital_tipo, capital_inicial, **(reglas or {}))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frecuencia = np.where(res['jugadas'] > 0, res['victorias'] / res['jugadas'], np.nan)
+        ratio = np.where(res['derrotas'] > 0, res['victorias'] / res['derrotas'], np.nan)
+
+    tabla = []
+    for s, (tipo_apuesta, seleccion) in enumerate(selecciones):
+        tabla.append({
+            'tipo_apuesta': tipo_apuesta,
+            'seleccion': seleccion,
+            'prob_teorica': probs[s],
+            'frecuencia': np.nanmean(frecuencia[s]) if np.isfinite(frecuencia[s]).any() else np.nan,
+            'win_loss_ratio': np.nanmean(ratio[s]) if np.isfinite(ratio[s]).any() else np.nan,
+            'ganancia_neta_media': res['ganancia_neta'][s].mean(),
+            'ganancia_neta_mediana': np.median(res['ganancia_neta'][s]),
+            'bancarrotas': int(res['bancarrota'][s].sum()),
+        })
+    return tabla
+
+
+def mostrar_todas_las_apuestas(tabla, n_corridas, estrategia, capital_tipo):
+    """Imprime la tabla ordenada por ganancia neta media y la grafica."""
+    tabla = sorted(tabla, key=lambda fila: fila['ganancia_neta_media'], reverse=True)
+
+    print("\n" + "=" * 100)
+    print(f"Todas las apuestas - Estrategia: {estrategia.upper()} - {n_corridas} corridas")
+    print("=" * 100)
+    print(f"{'apuesta':<22}{'prob. teórica':>14}{'frecuencia':>12}{'vict/derr':>11}"
+          f"{'gan. media':>16}{'gan. mediana':>16}{'bancarrotas':>13}")
+    for fila in tabla:
+        nombre = f"{fila['tipo_apuesta']} {fila['seleccion']}"
+        print(f"{nombre:<22}{fila['prob_teorica']:>14.4f}{fila['frecuencia']:>12.4f}{fila['win_loss_ratio']:>11.4f}"
+              f"{fila['ganancia_neta_media']:>16.2f}{fila['ganancia_neta_mediana']:>16.2f}"
+              f"{fila['bancarrotas'] if capital_tipo == 'f' else '-':>13}")
+
+    plt.figure(figsize=(10, 12))
+    nombres = [f"{fila['tipo_apuesta']} {fila['seleccion']}" for fila in tabla]
+    valores = [fila['ganancia_neta_media'] for fila in tabla]
+    plt.barh(nombres, valores, color=['green' if v > 0 else 'red' for v in valores])
+    plt.axvline(x=0, color='black', linestyle='-', linewidth=0.5)
+    plt.gca().invert_yaxis()
+    plt.title(f'Ganancia neta media por apuesta - Estrategia: {estrategia.upper()}')
+    plt.xlabel('Ganancia neta media')
+    plt.grid(axis='x', linestyle='--', alpha=0.7)
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,72 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+# Series por tirada que se derivan del registro de victorias de cada corrida
+SERIES = ('frecuencias', 'victorias_acumuladas', 'win_loss_ratio')
+
+
+def empaquetar(registro):
+    """Empaqueta un registro de victorias (bytearray de 0/1, uno por tirada) a 1 bit por tirada."""
+    return np.packbits(np.frombuffer(bytes(registro), dtype=np.uint8))
+
+
+def desempaquetar(paquete, jugadas):
+    """Devuelve el registro de victorias de un paquete como bytearray de 0/1."""
+    return bytearray(np.unpackbits(paquete, count=jugadas).tobytes())
+
+
+def serie(nombre, paquete, jugadas, n_tiradas):
+    """
+    Calcula una de las SERIES de una corrida a partir de sus victorias.
+
+    Las primeras `jugadas` tiradas salen de sumas acumuladas del registro;
+    el resto (corridas que terminaron en bancarrota) repite el último valor,
+    igual que _rellenar_corrida.
+    """
+    victorias = np.cumsum(np.unpackbits(paquete, count=jugadas), dtype=np.int64)
+    tiradas = np.arange(1, jugadas + 1)
+    if nombre == 'victorias_acumuladas':
+        valores, vacio = victorias, 0
+    elif nombre == 'frecuencias':
+        valores, vacio = victorias / tiradas, np.nan
+    else:
+        derrotas = tiradas - victorias
+        with np.errstate(divide='ignore', invalid='ignore'):
+            valores = np.where(derrotas > 0, victorias / derrotas, np.nan)
+        vacio = np.nan
+    if jugadas < n_tiradas:
+        relleno = valores[-1] if jugadas else vacio
+        valores = np.concatenate([valores, np.full(n_tiradas - jugadas, relleno, dtype=np.result_type(valores, relleno))])
+    return valores
+
+
+class SerieDerivada(Sequence):
+    """
+    Vista perezosa de una de las SERIES sobre todas las corridas de unos
+    resultados de simular_ruleta.
+
+    Se indexa como la lista de listas que había antes (resultados['frecuencias'][0]),
+    pero cada corrida se calcula recién cuando se pide, desde el registro de
+    victorias empaquetado. Sin selección las series son NaN (o 0 las victorias).
+    """
+
+    def __init__(self, resultados, nombre):
+        if nombre not in SERIES:
+            raise ValueError(f"Serie desconocida: {nombre}")
+        self.resultados = resultados
+        self.nombre = nombre
+
+    def __len__(self):
+        return len(self.resultados['victorias_bits'])
+
+    def __getitem__(self, corrida):
+        if isinstance(corrida, slice):
+            return [self[i] for i in range(*corrida.indices(len(self)))]
+        if not -len(self) <= corrida < len(self):
+            raise IndexError("corrida fuera de rango")
+        n_tiradas = len(self.resultados['capital'][corrida])
+        if self.resultados['seleccion'] is None:
+            return np.zeros(n_tiradas, dtype=np.int64) if self.nombre == 'victorias_acumuladas' else np.full(n_tiradas, np.nan)
+        return serie(self.nombre, self.resultados['victorias_bits'][corrida],
+                     self.resultados['jugadas'][corrida], n_tiradas)
@@ -1,4 +1,7 @@
+import os
+import sys
 import random
+import argparse
 from generadorGCL import (
     generador_gcl,
     prueba_frecuencia,
@@ -6,48 +9,121 @@ from generadorGCL import (
     prueba_corridas,
     prueba_poker
 )
-import matplotlib.pyplot as plt
+from graficos import graficar_pares, graficar_triples
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utilidades import perfilado, progresivo, distribuido
 
 # Configuración general
 CANTIDAD_NUMEROS = 10000
 SEMILLA = 12345
 
-# === Generación de números ===
-
-# 1. Números con GCL
-numeros_gcl = generador_gcl(a=1664525, c=1013904223, m=2**32, semilla=SEMILLA, cantidad=CANTIDAD_NUMEROS)
-
-# 2. Números con random de Python
-random.seed(SEMILLA)  # Fijamos la semilla para comparar en igualdad de condiciones
-numeros_py = [random.random() for _ in range(CANTIDAD_NUMEROS)]
-
 # === Comparación mediante pruebas ===
 
-def ejecutar_pruebas(nombre, numeros):
-
-    # Gráfico de dispersión (x_i, x_{i+1})
-    x = numeros[:-1]
-    y = numeros[1:]
+def ejecutar_pruebas(nombre, numeros, perfil=None, modo_pares='densidad', resolucion=512, triples=False):
 
-    plt.figure(figsize=(6, 6))
-    plt.scatter(x, y, s=0.2, color='black')
-    plt.title(f"Dispersión de pares consecutivos - {nombre}")
-    plt.xlabel("$x_i$")
-    plt.ylabel("$x_{i+1}$")
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
+    # Gráfico de pares consecutivos (x_i, x_{i+1})
+    with perfilado.medir_fase(perfil, f'{nombre}/graficado', excluir_show=True):
+        graficar_pares(numeros, nombre, modo=modo_pares, resolucion=resolucion)
+        if triples:
+            graficar_triples(numeros, nombre, resolucion=resolucion)
 
     print("\n" + "="*40)
     print(f"🧪 Resultados para {nombre}")
     print("="*40)
-    prueba_frecuencia(numeros, k=10)
-    prueba_series(numeros, k=10)
-    prueba_corridas(numeros)
-    prueba_poker(numeros)
+    with perfilado.medir_fase(perfil, f'{nombre}/prueba_frecuencia', excluir_show=True):
+        prueba_frecuencia(numeros, k=10)
+    with perfilado.medir_fase(perfil, f'{nombre}/prueba_series', excluir_show=True):
+        prueba_series(numeros, k=10)
+    with perfilado.medir_fase(perfil, f'{nombre}/prueba_corridas'):
+        prueba_corridas(numeros)
+    with perfilado.medir_fase(perfil, f'{nombre}/prueba_poker'):
+        prueba_poker(numeros)
+
+
+# === Batería repetida (modo distribuido) ===
+
+def resumir_bateria(n_corridas, generador, cantidad=CANTIDAD_NUMEROS):
+    """
+    Corre la batería de pruebas sobre n_corridas secuencias independientes
+    del generador ('gcl' o 'random') y devuelve un resumen de lote (ver
+    utilidades.progresivo): la proporción de secuencias que pasa cada prueba
+    y el promedio de cada estadístico.
+
+    La semilla de cada secuencia sale de random, así que el modo distribuido
+    puede asignarle a cada corrida su propia subsecuencia.
+    """
+    pruebas = {'frecuencia': prueba_frecuencia, 'series': prueba_series,
+               'corridas': prueba_corridas, 'poker': prueba_poker}
+    escalares = {f'pasa_{nombre}': [] for nombre in pruebas}
+    escalares.update({f'estadistico_{nombre}': [] for nombre in pruebas})
+    for _ in range(n_corridas):
+        if generador == 'gcl':
+            numeros = generador_gcl(a=1664525, c=1013904223, m=2**32, semilla=random.getrandbits(32), cantidad=cantidad)
+        else:
+            numeros = [random.random() for _ in range(cantidad)]
+        for nombre, prueba in pruebas.items():
+            resultado = prueba(numeros, mostrar=False)
+            escalares[f'pasa_{nombre}'].append(resultado['pasa'])
+            escalares[f'estadistico_{nombre}'].append(resultado['estadistico'])
+    return progresivo.resumen_lote(escalares, {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Comparación GCL vs random de Python')
+    parser.add_argument('--pares', choices=['densidad', 'dispersion'], default='densidad',
+                        help='Gráfico de pares: densidad (imagen) o dispersion (un punto por par) (opcional, default=densidad)')
+    parser.add_argument('--resolucion', type=int, default=512,
+                        help='Lado en celdas de las imágenes de densidad (opcional, default=512)')
+    parser.add_argument('--triples', action='store_true',
+                        help='Muestra también las proyecciones de ternas (x_i, x_{i+1}, x_{i+2}) (opcional)')
+    parser.add_argument('--replicas', type=int, default=100,
+                        help='Secuencias independientes por generador en modo distribuido (opcional, default=100)')
+    parser.add_argument('--semilla', type=int, default=SEMILLA,
+                        help=f'Semilla de las secuencias en modo distribuido (opcional, default={SEMILLA})')
+    distribuido.agregar_argumentos(parser)
+    perfilado.agregar_argumentos(parser)
+    args = parser.parse_args()
+    perfil = perfilado.crear_perfilador(args, 'TP_2 comparacion')
+
+    if args.distribuido:
+        # La batería se repite sobre muchas secuencias, repartidas entre los trabajadores
+        conjuntos = [('GCL', {'generador': 'gcl'}), ('Random de Python', {'generador': 'random'})]
+        with perfilado.medir_fase(perfil, 'bateria_distribuida'):
+            resumenes = distribuido.ejecutar_distribuido(
+                'comparacion', 'resumir_bateria', conjuntos, args.replicas, args.semilla, tam_shard=args.tam_shard,
+                host=args.host, puerto=args.puerto, clave=args.clave,
+                trabajadores_locales=args.trabajadores_locales, plazo=args.plazo)
+        distribuido.mostrar_resumenes(resumenes, f'Batería de pruebas - {args.replicas} secuencias de '
+                                                 f'{CANTIDAD_NUMEROS} números (semilla {args.semilla})')
+        perfilado.cerrar_perfilador(perfil, args)
+        return
+
+    # === Generación de números ===
+
+    # 1. Números con GCL
+    with perfilado.medir_fase(perfil, 'GCL/generacion'):
+        numeros_gcl = generador_gcl(a=1664525, c=1013904223, m=2**32, semilla=SEMILLA, cantidad=CANTIDAD_NUMEROS)
+
+    # 2. Números con random de Python
+    with perfilado.medir_fase(perfil, 'Random de Python/generacion'):
+        random.seed(SEMILLA)  # Fijamos la semilla para comparar en igualdad de condiciones
+        numeros_py = [random.random() for _ in range(CANTIDAD_NUMEROS)]
+
+    if perfil is not None:
+        perfil.metricas['numeros_por_seg'] = {
+            nombre: CANTIDAD_NUMEROS / perfil.fases[f'{nombre}/generacion']
+            for nombre in ('GCL', 'Random de Python')
+        }
+
+    # Ejecutamos para GCL
+    ejecutar_pruebas("GCL", numeros_gcl, perfil, args.pares, args.resolucion, args.triples)
+
+    # Ejecutamos para Random de Python
+    ejecutar_pruebas("Random de Python", numeros_py, perfil, args.pares, args.resolucion, args.triples)
+
+    perfilado.cerrar_perfilador(perfil, args)
 
-# Ejecutamos para GCL
-ejecutar_pruebas("GCL", numeros_gcl)
 
-# Ejecutamos para Random de Python
-ejecutar_pruebas("Random de Python", numeros_py)
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,10 @@
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utilidades import perfilado
+
 def generador_cuadrados_medios(semilla, cantidad, digitos=4):
     """Genera números pseudoaleatorios usando el método de los cuadrados medios."""
     numeros = []
@@ -9,7 +16,24 @@ def generador_cuadrados_medios(semilla, cantidad, digitos=4):
         numeros.append(x / (10**digitos))
     return numeros
 
-semilla = 5731  # Tiene que tener tantos dígitos como definas (4 en este caso)
-cantidad = 1000
 
-numeros_cm = generador_cuadrados_medios(semilla, cantidad)
+def main():
+    parser = argparse.ArgumentParser(description='Generador de cuadrados medios')
+    perfilado.agregar_argumentos(parser)
+    args = parser.parse_args()
+    perfil = perfilado.crear_perfilador(args, 'TP_2 generadorCM')
+
+    semilla = 5731  # Tiene que tener tantos dígitos como definas (4 en este caso)
+    cantidad = 1000
+
+    with perfilado.medir_fase(perfil, 'generacion'):
+        numeros_cm = generador_cuadrados_medios(semilla, cantidad)
+    if perfil is not None:
+        perfil.contar('numeros', len(numeros_cm))
+        perfil.metricas['numeros_por_seg'] = len(numeros_cm) / perfil.fases['generacion']
+
+    perfilado.cerrar_perfilador(perfil, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,14 @@
+import os
+import sys
+import argparse
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy.stats import chi2
 from collections import Counter
+from graficos import SecuenciaGCL, graficar_pares, graficar_triples
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utilidades import perfilado
 
 
 # Generador GCL
@@ -14,13 +21,16 @@ def generador_gcl(a, c, m, semilla, cantidad):
     return numeros
 
 # Prueba de Frecuencia (Chi-cuadrado)
-def prueba_frecuencia(numeros, k=10, alpha=0.05):
+def prueba_frecuencia(numeros, k=10, alpha=0.05, mostrar=True):
     n = len(numeros)
     intervalos = np.linspace(0, 1, k + 1)
     fo, _ = np.histogram(numeros, bins=intervalos)
     fe = n / k
     chi_cuadrado = np.sum(((fo - fe) ** 2) / fe)
     chi_critico = chi2.ppf(1 - alpha, df=k - 1)
+    resultado = {'estadistico': chi_cuadrado, 'critico': chi_critico, 'pasa': bool(chi_cuadrado < chi_critico)}
+    if not mostrar:
+        return resultado
 
     print("Frecuencias observadas:", fo)
     print("Frecuencia esperada:", fe)
@@ -40,9 +50,10 @@ def prueba_frecuencia(numeros, k=10, alpha=0.05):
     plt.ylabel("Frecuencia")
     plt.legend()
     plt.show()
+    return resultado
 
 #Verifica si los pares consecutivos (𝑥𝑖,𝑥𝑖+1)(x i,x i+1​) están uniformemente distribuidos en el plano [0,1)×[0,1).
-def prueba_series(numeros, k=10, alpha=0.05):
+def prueba_series(numeros, k=10, alpha=0.05, mostrar=True):
     n = len(numeros) - 1
     fe = n / (k ** 2)
 
@@ -57,6 +68,9 @@ def prueba_series(numeros, k=10, alpha=0.05):
 
     chi_cuadrado = np.sum((fo - fe) ** 2 / fe)
     chi_critico = chi2.ppf(1 - alpha, df=k * k - 1)
+    resultado = {'estadistico': chi_cuadrado, 'critico': chi_critico, 'pasa': bool(chi_cuadrado < chi_critico)}
+    if not mostrar:
+        return resultado
 
     print("Chi-cuadrado (Series):", round(chi_cuadrado, 4))
     print("Chi-crítico:", round(chi_critico, 4))
@@ -73,9 +87,10 @@ def prueba_series(numeros, k=10, alpha=0.05):
     plt.ylabel("x_{i+1}")
     plt.colorbar(label="Frecuencia")
     plt.show()
+    return resultado
 
 # Mide si hay demasiadas subidas o bajadas en la secuencia. Se cuentan las "corridas", es decir, secuencias crecientes o decrecientes.
-def prueba_corridas(numeros, alpha=0.05):
+def prueba_corridas(numeros, alpha=0.05, mostrar=True):
     n = len(numeros)
     corridas = 1
 
@@ -87,6 +102,9 @@ def prueba_corridas(numeros, alpha=0.05):
     media = (2 * n - 1) / 3
     varianza = (16 * n - 29) / 90
     z = (corridas - media) / (varianza ** 0.5)
+    resultado = {'estadistico': z, 'critico': 1.96, 'pasa': bool(abs(z) < 1.96)}
+    if not mostrar:
+        return resultado
 
     print("Corridas observadas:", corridas)
     print("Media esperada:", round(media, 2))
@@ -96,6 +114,7 @@ def prueba_corridas(numeros, alpha=0.05):
         print("✅ Pasa la prueba de corridas.")
     else:
         print("❌ No pasa la prueba de corridas.")
+    return resultado
 
 
 def clasificar_mano(digitos):
@@ -116,7 +135,7 @@ def clasificar_mano(digitos):
     else:
         return "todos distintos"
 
-def prueba_poker(numeros, alpha=0.05):
+def prueba_poker(numeros, alpha=0.05, mostrar=True):
     n = len(numeros)
     clases = ["todos distintos", "par", "doble par", "trío", "full", "póker", "quintilla"]
     fo = dict.fromkeys(clases, 0)
@@ -139,6 +158,9 @@ def prueba_poker(numeros, alpha=0.05):
 
     chi_cuadrado = sum(((fo[c] - fe[c]) ** 2) / fe[c] for c in clases if fe[c] > 0)
     chi_critico = chi2.ppf(1 - alpha, df=len(clases) - 1)
+    resultado = {'estadistico': chi_cuadrado, 'critico': chi_critico, 'pasa': bool(chi_cuadrado < chi_critico)}
+    if not mostrar:
+        return resultado
 
     print("Chi-cuadrado (Poker):", round(chi_cuadrado, 4))
     print("Chi-crítico:", round(chi_critico, 4))
@@ -147,25 +169,54 @@ def prueba_poker(numeros, alpha=0.05):
         print("✅ Pasa la prueba de poker.")
     else:
         print("❌ No pasa la prueba de poker.")
-
-
-numeros = generador_gcl(a=1664525, c=1013904223, m=2**32, semilla=12345, cantidad=10000)
-
-# Gráfico de dispersión de (x_i, x_{i+1})
-x = numeros[:-1]
-y = numeros[1:]
-
-plt.figure(figsize=(6, 6))
-plt.scatter(x, y, s=0.2, color='black')  # Puntitos bien pequeños
-plt.title("Dispersión de pares consecutivos - GCL")
-plt.xlabel("$x_i$")
-plt.ylabel("$x_{i+1}$")
-plt.grid(True)
-plt.tight_layout()
-plt.show()
-
-prueba_frecuencia(numeros, k=10)
-prueba_series(numeros, k=10)
-prueba_corridas(numeros)
-prueba_poker(numeros)
-
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generador GCL y pruebas de aleatoriedad')
+    parser.add_argument('--cantidad', type=int, default=10000,
+                        help='Cantidad de números para las pruebas (opcional, default=10000)')
+    parser.add_argument('--pares', choices=['densidad', 'dispersion'], default='densidad',
+                        help='Gráfico de pares: densidad (imagen) o dispersion (un punto por par) (opcional, default=densidad)')
+    parser.add_argument('--cantidad_pares', type=int, default=None,
+                        help='Cantidad de números del gráfico de densidad; se generan de a bloques (opcional, default=--cantidad)')
+    parser.add_argument('--resolucion', type=int, default=512,
+                        help='Lado en celdas de las imágenes de densidad (opcional, default=512)')
+    parser.add_argument('--triples', action='store_true',
+                        help='Muestra también las proyecciones de ternas (x_i, x_{i+1}, x_{i+2}) (opcional)')
+    perfilado.agregar_argumentos(parser)
+    args = parser.parse_args()
+    perfil = perfilado.crear_perfilador(args, 'TP_2 generadorGCL')
+
+    parametros = dict(a=1664525, c=1013904223, m=2**32, semilla=12345)
+    with perfilado.medir_fase(perfil, 'generacion'):
+        numeros = generador_gcl(cantidad=args.cantidad, **parametros)
+    if perfil is not None:
+        perfil.contar('numeros', len(numeros))
+        perfil.metricas['numeros_por_seg'] = len(numeros) / perfil.fases['generacion']
+
+    # Gráfico de pares (x_i, x_{i+1}); en modo densidad la secuencia se genera de a bloques
+    with perfilado.medir_fase(perfil, 'graficado', excluir_show=True):
+        if args.pares == 'densidad' and args.cantidad_pares is not None:
+            muestra = SecuenciaGCL(cantidad=args.cantidad_pares, **parametros)
+        else:
+            muestra = numeros
+        graficar_pares(muestra, "GCL", modo=args.pares, resolucion=args.resolucion)
+        if args.triples:
+            graficar_triples(muestra, "GCL", resolucion=args.resolucion)
+
+    # Las pruebas de frecuencia y series también grafican; ese tiempo queda dentro de cada prueba
+    with perfilado.medir_fase(perfil, 'prueba_frecuencia', excluir_show=True):
+        prueba_frecuencia(numeros, k=10)
+    with perfilado.medir_fase(perfil, 'prueba_series', excluir_show=True):
+        prueba_series(numeros, k=10)
+    with perfilado.medir_fase(perfil, 'prueba_corridas'):
+        prueba_corridas(numeros)
+    with perfilado.medir_fase(perfil, 'prueba_poker'):
+        prueba_poker(numeros)
+
+    perfilado.cerrar_perfilador(perfil, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+
+# Con un punto por par, plt.scatter se vuelve inusable a partir de ~1e6 números.
+# Acá los pares se cuentan directo en una imagen de resolución fija (bincount),
+# bloque por bloque, así la memoria no depende de la cantidad de números.
+
+TAM_BLOQUE = 2**18  # Bloques que entran en caché; más grandes resultan más lentos
+
+
+def _coeficientes_salto(a, c, m, largo):
+    """
+    Devuelve (A, C) con A[k-1] = a^k mod m y C[k-1] = c(a^(k-1) + ... + 1) mod m,
+    para k = 1..largo. Así x_{n+k} = (A[k-1] x_n + C[k-1]) mod m.
+
+    Se arman por duplicación: si se conocen los primeros L términos,
+    x_{n+L+j} = A_j (A_L x_n + C_L) + C_j, y todos los productos entran en uint64
+    porque m <= 2^32.
+    """
+    A = np.array([a % m], dtype=np.uint64)
+    C = np.array([c % m], dtype=np.uint64)
+    m64 = np.uint64(m)
+    while len(A) < largo:
+        A_L, C_L = A[-1], C[-1]
+        A = np.concatenate([A, (A * A_L) % m64])
+        C = np.concatenate([C, (A[:len(C)] * C_L + C) % m64])
+    return A[:largo], C[:largo]
+
+
+class SecuenciaGCL:
+    """
+    La misma secuencia que generador_gcl, pero generada de a bloques de numpy.
+
+    Cada bloque se calcula de una sola vez a partir del último valor del bloque
+    anterior (salto hacia adelante), sin bucle de Python por número. Iterarla
+    devuelve bloques de floats en [0, 1); densidad_tuplas además aprovecha que
+    son enteros para calcular las celdas sin pasar por floats.
+    """
+
+    def __init__(self, a, c, m, semilla, cantidad, tam_bloque=TAM_BLOQUE):
+        if m > 2**32:
+            raise ValueError("SecuenciaGCL necesita m <= 2^32 para que los productos entren en uint64")
+        self.a, self.c, self.m = a, c, m
+        self.semilla = semilla
+        self.cantidad = cantidad
+        self.tam_bloque = max(1, min(tam_bloque, cantidad))
+
+    def estados(self):
+        """Genera bloques de enteros x_n (uint64), sin dividir por m. Reusa el mismo buffer."""
+        A, C = _coeficientes_salto(self.a, self.c, self.m, self.tam_bloque)
+        potencia_de_2 = (self.m & (self.m - 1)) == 0
+        mascara = np.uint64(self.m - 1)
+        m64 = np.uint64(self.m)
+        bloque = np.empty_like(A)
+        x = np.uint64(self.semilla % self.m)
+        generados = 0
+        while generados < self.cantidad:
+            n = min(self.tam_bloque, self.cantidad - generados)
+            salida = bloque[:n]
+            np.multiply(A[:n], x, out=salida)
+            np.add(salida, C[:n], out=salida)
+            if potencia_de_2:
+                # El desborde de uint64 es módulo 2^64, que es múltiplo de m
+                np.bitwise_and(salida, mascara, out=salida)
+            else:
+                np.remainder(salida, m64, out=salida)
+            x = salida[-1]
+            generados += n
+            yield salida
+
+    def indices(self, resolucion):
+        """Genera bloques con la celda (0..resolucion-1) de cada número."""
+        res = np.uint64(resolucion)
+        desplazamiento = None
+        if (self.m & (self.m - 1)) == 0 and (resolucion & (resolucion - 1)) == 0 and resolucion <= self.m:
+            desplazamiento = np.uint64(self.m.bit_length() - resolucion.bit_length())
+        for bloque in self.estados():
+            if desplazamiento is not None:
+                # En el lugar: los valores quedan < 2^63, así que verlos como int64 no copia
+                np.right_shift(bloque, desplazamiento, out=bloque)
+                yield bloque.view(np.intp)
+            else:
+                yield (bloque * res // np.uint64(self.m)).astype(np.intp)
+
+    def __iter__(self):
+        for bloque in self.estados():
+            yield bloque / self.m
+
+
+def _como_bloques(numeros, tam_bloque=TAM_BLOQUE):
+    """Acepta una lista/array o un iterable de bloques y devuelve bloques de numpy."""
+    if isinstance(numeros, (list, tuple, np.ndarray)):
+        numeros = np.asarray(numeros, dtype=np.float64)
+        for inicio in range(0, len(numeros), tam_bloque):
+            yield numeros[inicio:inicio + tam_bloque]
+    else:
+        for bloque in numeros:
+            yield np.asarray(bloque, dtype=np.float64)
+
+
+def _bloques_indices(numeros, resolucion, tam_bloque):
+    if isinstance(numeros, SecuenciaGCL):
+        yield from numeros.indices(resolucion)
+        return
+    for bloque in _como_bloques(numeros, tam_bloque):
+        ind = (bloque * resolucion).astype(np.intp)
+        np.clip(ind, 0, resolucion - 1, out=ind)
+        yield ind
+
+
+def densidad_tuplas(numeros, resolucion=512, ejes=((0, 1),), tam_bloque=TAM_BLOQUE):
+    """
+    Cuenta las tuplas consecutivas (x_i, x_{i+1}, ...) proyectadas sobre los
+    planos indicados en `ejes`, en imágenes de resolucion x resolucion.
+
+    Args:
+        numeros: Lista/array de números en [0, 1), iterable de bloques o SecuenciaGCL
+        resolucion: Lado de cada imagen, en celdas
+        ejes: Pares (p, q) de desplazamientos; (0, 1) es el plano (x_i, x_{i+1})
+        tam_bloque: Tamaño de bloque al partir una lista/array
+
+    Returns:
+        Lista de matrices de conteos (una por plano), indexadas [fila=x_{i+q}, col=x_{i+p}]
+    """
+    dimension = max(max(p, q) for p, q in ejes) + 1
+    celdas = resolucion * resolucion
+    conteos = [np.zeros(celdas, dtype=np.int64) for _ in ejes]
+    # Últimos índices del bloque anterior, para no perder las tuplas que cruzan el borde
+    cola = np.empty(0, dtype=np.intp)
+    buffer = np.empty(0, dtype=np.intp)
+
+    def contar(ind):
+        nonlocal buffer
+        n_tuplas = len(ind) - dimension + 1
+        if n_tuplas <= 0:
+            return
+        if len(buffer) < n_tuplas:
+            buffer = np.empty(n_tuplas, dtype=np.intp)
+        celda = buffer[:n_tuplas]
+        for conteo, (p, q) in zip(conteos, ejes):
+            np.multiply(ind[q:q + n_tuplas], resolucion, out=celda)
+            np.add(celda, ind[p:p + n_tuplas], out=celda)
+            conteo += np.bincount(celda, minlength=celdas)
+
+    for ind in _bloques_indices(numeros, resolucion, tam_bloque):
+        if dimension > 1:
+            # Tuplas del borde: la cola anterior más el principio de este bloque
+            contar(np.concatenate([cola, ind[:dimension - 1]]))
+            cola = np.concatenate([cola, ind[-(dimension - 1):]])[-(dimension - 1):]
+        contar(ind)
+
+    return [conteo.reshape(resolucion, resolucion) for conteo in conteos]
+
+
+def _mostrar_densidad(ax, conteo, titulo, etiqueta_x, etiqueta_y):
+    # Escala logarítmica para que se vean tanto las celdas vacías como las muy llenas
+    imagen = ax.imshow(np.ma.masked_equal(conteo, 0), origin='lower', extent=(0, 1, 0, 1),
+                       cmap='magma', norm=LogNorm(vmin=1, vmax=max(conteo.max(), 1)),
+                       interpolation='nearest')
+    ax.set_facecolor('black')
+    ax.set_title(titulo)
+    ax.set_xlabel(etiqueta_x)
+    ax.set_ylabel(etiqueta_y)
+    return imagen
+
+
+def graficar_pares(numeros, nombre, modo='densidad', resolucion=512):
+    """
+    Gráfico de pares consecutivos (x_i, x_{i+1}).
+
+    Args:
+        numeros: Lista/array de números en [0, 1); en modo densidad también un
+            iterable de bloques o una SecuenciaGCL (memoria constante)
+        nombre: Nombre del generador para el título
+        modo: 'densidad' (imagen de conteos, memoria constante) o 'dispersion' (un punto por par)
+        resolucion: Lado de la imagen en modo densidad
+    """
+    if modo == 'dispersion':
+        x = numeros[:-1]
+        y = numeros[1:]
+
+        plt.figure(figsize=(6, 6))
+        plt.scatter(x, y, s=0.2, color='black')  # Puntitos bien pequeños
+        plt.title(f"Dispersión de pares consecutivos - {nombre}")
+        plt.xlabel("$x_i$")
+        plt.ylabel("$x_{i+1}$")
+        plt.grid(True)
+        plt.tight_layout()
+        plt.show()
+        return
+
+    conteo, = densidad_tuplas(numeros, resolucion=resolucion)
+    fig, ax = plt.subplots(figsize=(7, 6))
+    imagen = _mostrar_densidad(ax, conteo, f"Densidad de pares consecutivos - {nombre}",
+                               "$x_i$", "$x_{i+1}$")
+    fig.colorbar(imagen, ax=ax, label="Pares por celda")
+    fig.tight_layout()
+    plt.show()
+
+
+def graficar_triples(numeros, nombre, resolucion=512):
+    """
+    Proyecciones de las ternas (x_i, x_{i+1}, x_{i+2}) sobre los tres planos
+    coordenados, como imágenes de densidad.
+    """
+    ejes = ((0, 1), (0, 2), (1, 2))
+    etiquetas = ("$x_i$", "$x_{i+1}$", "$x_{i+2}$")
+    conteos = densidad_tuplas(numeros, resolucion=resolucion, ejes=ejes)
+
+    fig, axs = plt.subplots(1, 3, figsize=(16, 5.5))
+    for ax, conteo, (p, q) in zip(axs, conteos, ejes):
+        imagen = _mostrar_densidad(ax, conteo, f"({etiquetas[p]}, {etiquetas[q]})",
+                                   etiquetas[p], etiquetas[q])
+    fig.colorbar(imagen, ax=axs, label="Ternas por celda")
+    fig.suptitle(f"Proyecciones de ternas consecutivas - {nombre}")
+    plt.show()
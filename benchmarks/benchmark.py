@@ -0,0 +1,308 @@
+"""
+Suite de benchmarks de los caminos calientes de los TPs.
+
+Mide tiradas/seg (o números/seg) y pico de memoria de:
+    - simular_ruleta de TP_1.1 y TP_1.2, escalando n_tiradas y n_corridas
+    - generador_gcl y generador_cuadrados_medios de TP_2, escalando la cantidad
+    - las cuatro pruebas (frecuencia, series, corridas, poker) de TP_2
+    - la imagen de densidad de pares de TP_2 sobre una SecuenciaGCL
+
+Uso:
+    python benchmark.py correr -o linea_base.json
+    python benchmark.py correr -o nuevo.json --filtro tp12
+    python benchmark.py comparar linea_base.json nuevo.json --umbral 0.10
+    python benchmark.py comparar linea_base.json nuevo.json --filtro tp12
+"""
+import os
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+import contextlib
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')  # Las pruebas de TP_2 grafican; acá no queremos ventanas
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utilidades.carga import cargar_modulo
+
+VERSION_FORMATO = 1
+TIEMPO_MINIMO = 0.05  # Segundos mínimos de cada repetición cronometrada
+
+# Tamaños de cada barrido según la escala elegida
+ESCALAS = {
+    'rapida': {
+        'tiradas': [1000, 10000],
+        'corridas': [1, 10],
+        'cantidad_gen': [10000, 100000],
+        'cantidad_pruebas': [10000],
+        'cantidad_densidad': [1000000],
+        'repeticiones': 5,
+    },
+    'completa': {
+        'tiradas': [1000, 10000, 100000],
+        'corridas': [1, 10, 100],
+        'cantidad_gen': [10000, 100000, 1000000],
+        'cantidad_pruebas': [10000, 100000],
+        'cantidad_densidad': [1000000, 10000000, 100000000],
+        'repeticiones': 5,
+    },
+}
+
+
+def _caso_ruleta11(n_tiradas, n_corridas):
+    modulo = cargar_modulo('ruleta11')
+    return lambda: modulo.simular_ruleta(n_tiradas, n_corridas, 17)
+
+
+def _caso_ruleta12(n_tiradas, n_corridas):
+    modulo = cargar_modulo('ruleta12')
+    return lambda: modulo.simular_ruleta(n_tiradas, n_corridas, seleccion=17, estrategia='m',
+                                         capital_tipo='i', tipo_apuesta='numero')
+
+
+def _caso_gcl(cantidad):
+    modulo = cargar_modulo('generadorGCL')
+    return lambda: modulo.generador_gcl(a=1664525, c=1013904223, m=2**32, semilla=12345, cantidad=cantidad)
+
+
+def _caso_cm(cantidad):
+    modulo = cargar_modulo('generadorCM')
+    return lambda: modulo.generador_cuadrados_medios(5731, cantidad)
+
+
+def _caso_densidad(cantidad):
+    graficos = cargar_modulo('graficos')
+    return lambda: graficos.densidad_tuplas(graficos.SecuenciaGCL(a=1664525, c=1013904223, m=2**32,
+                                                                  semilla=12345, cantidad=cantidad))
+
+
+def _caso_prueba(nombre_prueba, cantidad):
+    modulo = cargar_modulo('generadorGCL')
+    numeros = modulo.generador_gcl(a=1664525, c=1013904223, m=2**32, semilla=12345, cantidad=cantidad)
+    prueba = getattr(modulo, nombre_prueba)
+
+    def correr():
+        prueba(numeros)
+        plt.close('all')
+    return correr
+
+
+def definir_casos(escala):
+    """
+    Arma la lista de casos del benchmark para una escala.
+
+    Cada caso es (nombre, grupo, parametros, unidades, fabrica), donde fabrica()
+    devuelve la función a medir y unidades es la cantidad de tiradas o números
+    que procesa una llamada.
+    """
+    conf = ESCALAS[escala]
+    casos = []
+
+    for prefijo, grupo, fabrica in (('tp11', 'tp11_simular_ruleta', _caso_ruleta11),
+                                    ('tp12', 'tp12_simular_ruleta', _caso_ruleta12)):
+        # Escalado en tiradas con una sola corrida
+        for n in conf['tiradas']:
+            params = {'n_tiradas': n, 'n_corridas': 1}
+            casos.append((f'{prefijo}[n_tiradas={n},n_corridas=1]', grupo, params, n,
+                          lambda f=fabrica, n=n: f(n, 1)))
+        # Escalado en corridas con 1000 tiradas (el caso 1000x1 ya está arriba)
+        for c in conf['corridas']:
+            if c == 1 and 1000 in conf['tiradas']:
+                continue
+            params = {'n_tiradas': 1000, 'n_corridas': c}
+            casos.append((f'{prefijo}[n_tiradas=1000,n_corridas={c}]', grupo, params, 1000 * c,
+                          lambda f=fabrica, c=c: f(1000, c)))
+
+    for n in conf['cantidad_gen']:
+        casos.append((f'gcl[cantidad={n}]', 'generador_gcl', {'cantidad': n}, n,
+                      lambda n=n: _caso_gcl(n)))
+        casos.append((f'cm[cantidad={n}]', 'generador_cuadrados_medios', {'cantidad': n}, n,
+                      lambda n=n: _caso_cm(n)))
+
+    for n in conf['cantidad_densidad']:
+        casos.append((f'densidad_pares_gcl[cantidad={n}]', 'densidad_pares', {'cantidad': n}, n,
+                      lambda n=n: _caso_densidad(n)))
+
+    for prueba in ('prueba_frecuencia', 'prueba_series', 'prueba_corridas', 'prueba_poker'):
+        for n in conf['cantidad_pruebas']:
+            casos.append((f'{prueba}[cantidad={n}]', prueba, {'cantidad': n}, n,
+                          lambda p=prueba, n=n: _caso_prueba(p, n)))
+
+    return casos
+
+
+def medir(funcion, repeticiones, semilla, tiempo_minimo=TIEMPO_MINIMO):
+    """
+    Devuelve (mejor tiempo por llamada en segundos, pico de memoria en bytes).
+
+    Antes de medir se hace una llamada sin cronometrar (importaciones, cachés,
+    primeras reservas de memoria). Cada repetición encadena las llamadas que
+    hagan falta para durar al menos `tiempo_minimo` (como timeit.autorange),
+    y de las repeticiones se queda la mejor. Antes de cada llamada se vuelve a
+    sembrar random, así todas hacen el mismo trabajo (con la martingala el
+    costo depende mucho de las tiradas que salgan). El tiempo se toma sin
+    tracemalloc (que agrega mucho overhead) y la memoria en una corrida aparte.
+    """
+    random.seed(semilla)
+    inicio = time.perf_counter()
+    funcion()  # Calentamiento: la primera llamada es varias veces más lenta
+    llamadas = max(1, int(tiempo_minimo / max(time.perf_counter() - inicio, 1e-9)))
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            random.seed(semilla)
+            funcion()
+        mejor = min(mejor, (time.perf_counter() - inicio) / llamadas)
+
+    random.seed(semilla)
+
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return mejor, pico
+
+
+def correr(args):
+    casos = definir_casos(args.escala)
+    if args.filtro:
+        casos = [caso for caso in casos if args.filtro in caso[0]]
+
+    resultados = {
+        'version': VERSION_FORMATO,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'escala': args.escala,
+        'filtro': args.filtro,
+        'casos': {},
+    }
+
+    for nombre, grupo, params, unidades, fabrica in casos:
+        random.seed(args.semilla)
+        funcion = fabrica()
+        # Las pruebas imprimen sus resultados; los silenciamos
+        with contextlib.redirect_stdout(io.StringIO()):
+            segundos, pico = medir(funcion, ESCALAS[args.escala]['repeticiones'], args.semilla)
+        por_seg = unidades / segundos if segundos > 0 else float('inf')
+        resultados['casos'][nombre] = {
+            'grupo': grupo,
+            'parametros': params,
+            'unidades': unidades,
+            'segundos': segundos,
+            'unidades_por_seg': por_seg,
+            'pico_memoria_bytes': pico,
+        }
+        print(f'{nombre:<45} {por_seg:>14,.0f} u/s {pico / 2**20:>10.2f} MiB')
+
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    print(f'\nResultados guardados en {args.salida}')
+
+
+def comparar_resultados(base, nuevo, umbral, umbral_memoria, filtro=None):
+    """
+    Compara dos reportes y devuelve (filas, regresiones, faltantes, sobrantes).
+
+    Hay regresión si el throughput cae más de `umbral` (fracción) o si el pico
+    de memoria crece más de `umbral_memoria`. `faltantes` son los casos de la
+    línea base que no están en el nuevo reporte y que el filtro (el pasado o,
+    si no, el que usó el nuevo reporte al correr) no deja afuera; `sobrantes`
+    son los casos nuevos sin línea base con qué compararlos.
+    """
+    if filtro is None:
+        filtro = nuevo.get('filtro')
+    filas = []
+    regresiones = []
+    sobrantes = []
+    for nombre, caso_nuevo in nuevo['casos'].items():
+        caso_base = base['casos'].get(nombre)
+        if caso_base is None:
+            sobrantes.append(nombre)
+            continue
+        ratio_vel = caso_nuevo['unidades_por_seg'] / caso_base['unidades_por_seg']
+        ratio_mem = (caso_nuevo['pico_memoria_bytes'] / caso_base['pico_memoria_bytes']
+                     if caso_base['pico_memoria_bytes'] > 0 else 1.0)
+        problemas = []
+        if ratio_vel < 1 - umbral:
+            problemas.append('velocidad')
+        if ratio_mem > 1 + umbral_memoria:
+            problemas.append('memoria')
+        filas.append((nombre, ratio_vel, ratio_mem, problemas))
+        if problemas:
+            regresiones.append(nombre)
+    faltantes = [nombre for nombre in base['casos']
+                 if nombre not in nuevo['casos'] and (not filtro or filtro in nombre)]
+    return filas, regresiones, faltantes, sobrantes
+
+
+def comparar(args):
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.nuevo, encoding='utf-8') as f:
+        nuevo = json.load(f)
+
+    filas, regresiones, faltantes, sobrantes = comparar_resultados(
+        base, nuevo, args.umbral, args.umbral_memoria, args.filtro)
+
+    print(f'{"caso":<45} {"velocidad":>10} {"memoria":>10}')
+    for nombre, ratio_vel, ratio_mem, problemas in filas:
+        marca = '  <-- REGRESIÓN (' + ', '.join(problemas) + ')' if problemas else ''
+        print(f'{nombre:<45} {ratio_vel:>9.2f}x {ratio_mem:>9.2f}x{marca}')
+    for nombre in faltantes:
+        print(f'{nombre:<45} {"--":>10} {"--":>10}  <-- FALTA en {args.nuevo}')
+    for nombre in sobrantes:
+        print(f'{nombre:<45} {"--":>10} {"--":>10}  (sin línea base)')
+
+    if regresiones or faltantes:
+        if regresiones:
+            print(f'\n❌ {len(regresiones)} regresiones por encima del umbral.')
+        if faltantes:
+            print(f'\n❌ {len(faltantes)} casos de la línea base no aparecen en el nuevo reporte.')
+        sys.exit(1)
+    print('\n✅ Sin regresiones.')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks de los TPs de Simulación')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_correr = sub.add_parser('correr', help='Ejecuta los benchmarks y guarda un JSON')
+    p_correr.add_argument('-o', '--salida', default='benchmark.json',
+                          help='Archivo JSON de salida (default=benchmark.json)')
+    p_correr.add_argument('--escala', choices=list(ESCALAS), default='completa',
+                          help='Tamaños de los barridos (default=completa)')
+    p_correr.add_argument('--filtro', default=None,
+                          help='Solo corre los casos cuyo nombre contiene este texto')
+    p_correr.add_argument('--semilla', type=int, default=12345,
+                          help='Semilla de random antes de cada llamada medida (default=12345)')
+    p_correr.set_defaults(funcion=correr)
+
+    p_comparar = sub.add_parser('comparar', help='Compara dos JSON y marca regresiones')
+    p_comparar.add_argument('base', help='JSON de la línea base')
+    p_comparar.add_argument('nuevo', help='JSON a comparar contra la línea base')
+    p_comparar.add_argument('--umbral', type=float, default=0.10,
+                            help='Caída de throughput tolerada, en fracción (default=0.10)')
+    p_comparar.add_argument('--umbral_memoria', type=float, default=0.20,
+                            help='Crecimiento de memoria tolerado, en fracción (default=0.20)')
+    p_comparar.add_argument('--filtro', default=None,
+                            help='Solo exige los casos de la línea base cuyo nombre contiene este texto '
+                                 '(default=el filtro con que se corrió el nuevo reporte)')
+    p_comparar.set_defaults(funcion=comparar)
+
+    args = parser.parse_args()
+    args.funcion(args)
+
+
+if __name__ == '__main__':
+    main()
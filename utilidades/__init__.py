@@ -0,0 +1 @@
+"""Herramientas compartidas por los TPs (carga de módulos, perfilado, etc.)."""
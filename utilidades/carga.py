@@ -0,0 +1,46 @@
+import os
+import sys
+import importlib.util
+
+# Raíz del repositorio (un nivel arriba de esta carpeta)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Los scripts de los TPs viven en carpetas con espacios y puntos en el nombre
+# ("TP_1.1 Ruleta", "TP_1.2/simulacion1.2.py"), así que no se pueden importar
+# con un import normal. Los cargamos por ruta.
+RUTAS = {
+    'ruleta11': os.path.join(RAIZ, 'TP_1.1 Ruleta', 'simulacion_ruleta.py'),
+    'ruleta12': os.path.join(RAIZ, 'TP_1.2', 'simulacion1.2.py'),
+    'generadorGCL': os.path.join(RAIZ, 'TP_2 NumAl', 'generadorGCL.py'),
+    'generadorCM': os.path.join(RAIZ, 'TP_2 NumAl', 'generadorCM.py'),
+    'graficos': os.path.join(RAIZ, 'TP_2 NumAl', 'graficos.py'),
+    'comparacion': os.path.join(RAIZ, 'TP_2 NumAl', 'comparacion.py'),
+}
+
+
+def cargar_modulo(nombre, ruta=None):
+    """
+    Carga un script de los TPs como módulo (una sola vez) y lo devuelve.
+
+    Args:
+        nombre: Nombre con el que se registra en sys.modules (ej: 'ruleta12')
+        ruta: Ruta al archivo .py (opcional si el nombre está en RUTAS)
+    """
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+
+    ruta = ruta or RUTAS[nombre]
+    # La carpeta del script va al path para que sus imports entre hermanos funcionen
+    carpeta = os.path.dirname(ruta)
+    if carpeta not in sys.path:
+        sys.path.insert(0, carpeta)
+
+    spec = importlib.util.spec_from_file_location(nombre, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre] = modulo
+    try:
+        spec.loader.exec_module(modulo)
+    except BaseException:
+        del sys.modules[nombre]
+        raise
+    return modulo
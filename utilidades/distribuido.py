@@ -0,0 +1,332 @@
+"""
+Ejecución repartida de corridas entre varios procesos o máquinas.
+
+Un coordinador parte el trabajo en shards (conjunto de parámetros, rango de
+corridas) y los reparte por TCP con un multiprocessing.managers.BaseManager.
+Los trabajadores piden shards, los simulan y devuelven un resumen parcial
+fusionable (ver utilidades.progresivo.resumen_lote).
+
+Reproducibilidad: cada corrida usa su propia subsecuencia de random,
+sembrada con f'{semilla}:{corrida}', y el coordinador fusiona los resúmenes
+en el orden de los shards. Así el resultado no depende de qué trabajador
+corrió cada shard ni de cuántos había. La subsecuencia no depende del
+conjunto de parámetros: todas las estrategias de un barrido juegan las mismas
+tiradas (números aleatorios comunes).
+
+Tolerancia a fallas: cada shard asignado tiene un plazo que el trabajador
+renueva con latidos mientras lo simula. Si el plazo vence (el trabajador
+murió o perdió la conexión), el shard vuelve a la cola y lo toma otro. Si la
+simulación de un shard lanza una excepción, el trabajador la informa al
+coordinador. Cuando un mismo shard falla MAX_FALLOS veces (por excepciones o
+plazos vencidos), el coordinador aborta con el último error.
+
+Seguridad: el gestor deserializa (pickle) lo que mandan los clientes
+autenticados, así que quien conoce la clave puede ejecutar código en el
+coordinador y en los trabajadores. Si no se pasa --clave, el coordinador
+genera una al azar y la muestra al arrancar.
+
+Uso, en cada máquina trabajadora:
+    python utilidades/distribuido.py trabajador --host IP_DEL_COORDINADOR --puerto 50000 --clave CLAVE
+"""
+import os
+import sys
+import time
+import random
+import socket
+import secrets
+import argparse
+import traceback
+import threading
+import multiprocessing as mp
+from collections import deque
+from multiprocessing.managers import BaseManager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utilidades.carga import cargar_modulo
+from utilidades.progresivo import fusionar_resumenes
+
+FIN = 'fin'  # Respuesta de pedir() cuando ya no queda trabajo (o cuando se abortó)
+MAX_FALLOS = 3  # Fallos de un mismo shard tras los que se aborta la ejecución
+
+
+class _Gestor(BaseManager):
+    pass
+
+
+class Coordinador:
+    """
+    Cola de shards con plazos. Los métodos públicos son los que llaman los
+    trabajadores a través del gestor, desde varios hilos a la vez.
+    """
+
+    def __init__(self, tareas, plazo=60.0, max_fallos=MAX_FALLOS):
+        self._tareas = tareas
+        self._plazo = plazo
+        self._max_fallos = max_fallos
+        self._fallos = {}  # indice -> veces que falló o venció
+        self._error = None  # Motivo para abortar, si un shard falló max_fallos veces
+        self._lock = threading.Lock()
+        self._pendientes = deque(range(len(tareas)))
+        self._asignadas = {}  # indice -> (trabajador, vencimiento)
+        self._resultados = {}
+        self._trabajadores = {}  # trabajador -> último contacto
+        self.reasignadas = 0
+
+    def _recuperar_vencidas(self):
+        ahora = time.monotonic()
+        for indice, (trabajador, vence) in list(self._asignadas.items()):
+            if vence < ahora:
+                del self._asignadas[indice]
+                self.reasignadas += 1
+                self._registrar_fallo(indice, f'{trabajador} dejó de responder mientras lo simulaba')
+
+    def _registrar_fallo(self, indice, detalle):
+        """Devuelve el shard a la cola o, si ya falló max_fallos veces, marca la ejecución como abortada."""
+        self._fallos[indice] = self._fallos.get(indice, 0) + 1
+        if self._fallos[indice] >= self._max_fallos:
+            if self._error is None:
+                self._error = f'El shard {indice} falló {self._fallos[indice]} veces. Último error: {detalle}'
+        elif indice not in self._resultados:
+            self._pendientes.appendleft(indice)
+
+    def pedir(self, trabajador):
+        """Devuelve la próxima tarea, None si hay que esperar (todo asignado) o FIN."""
+        with self._lock:
+            self._trabajadores[trabajador] = time.monotonic()
+            self._recuperar_vencidas()
+            if len(self._resultados) == len(self._tareas) or self._error is not None:
+                return FIN
+            if not self._pendientes:
+                return None
+            indice = self._pendientes.popleft()
+            self._asignadas[indice] = (trabajador, time.monotonic() + self._plazo)
+            return dict(self._tareas[indice], indice=indice, plazo=self._plazo)
+
+    def latido(self, trabajador, indice):
+        """Renueva el plazo del shard que está simulando el trabajador."""
+        with self._lock:
+            self._trabajadores[trabajador] = time.monotonic()
+            if self._asignadas.get(indice, (None,))[0] == trabajador:
+                self._asignadas[indice] = (trabajador, time.monotonic() + self._plazo)
+
+    def fallar(self, trabajador, indice, detalle):
+        """Informa que la simulación del shard lanzó una excepción (detalle: el traceback)."""
+        with self._lock:
+            self._trabajadores[trabajador] = time.monotonic()
+            if self._asignadas.get(indice, (None,))[0] == trabajador:
+                del self._asignadas[indice]
+                self._registrar_fallo(indice, f'en {trabajador}:\n{detalle}')
+
+    def entregar(self, trabajador, indice, parcial):
+        with self._lock:
+            self._trabajadores[trabajador] = time.monotonic()
+            # Si el shard se había reasignado, llegan dos resultados iguales: vale el primero
+            if indice not in self._resultados:
+                self._resultados[indice] = parcial
+            self._asignadas.pop(indice, None)
+            if indice in self._pendientes:
+                self._pendientes.remove(indice)
+
+    def estado(self):
+        """(shards terminados, total, trabajadores vistos en el último plazo, shards reasignados)."""
+        with self._lock:
+            self._recuperar_vencidas()
+            activos = sum(1 for visto in self._trabajadores.values()
+                          if time.monotonic() - visto < self._plazo)
+            return len(self._resultados), len(self._tareas), activos, self.reasignadas
+
+    def error(self):
+        """Motivo por el que hay que abortar, o None."""
+        with self._lock:
+            return self._error
+
+    def resultados(self):
+        with self._lock:
+            return dict(self._resultados)
+
+
+def ejecutar_shard(tarea):
+    """Simula las corridas de un shard, cada una con su subsecuencia, y fusiona sus resúmenes."""
+    resumir = getattr(cargar_modulo(tarea['modulo']), tarea['funcion'])
+    total = None
+    for corrida in range(tarea['inicio'], tarea['fin']):
+        random.seed(f"{tarea['semilla']}:{corrida}")
+        parcial = resumir(1, **tarea['parametros'])
+        total = parcial if total is None else fusionar_resumenes(total, parcial)
+    return total
+
+
+def _conectar(host, puerto, clave):
+    _Gestor.register('coordinador')
+    gestor = _Gestor(address=(host, puerto), authkey=clave.encode())
+    gestor.connect()
+    return gestor.coordinador()
+
+
+def _latir(host, puerto, clave, trabajador, indice, intervalo, parar):
+    # Conexión propia: los proxies no se comparten entre hilos
+    coordinador = _conectar(host, puerto, clave)
+    while not parar.wait(intervalo):
+        coordinador.latido(trabajador, indice)
+
+
+def trabajar(host, puerto, clave, nombre=None, espera=0.5):
+    """
+    Bucle de un trabajador: pide shards hasta que no queda trabajo o el
+    coordinador desaparece. Devuelve la cantidad de shards simulados.
+    """
+    nombre = nombre or f'{socket.gethostname()}:{os.getpid()}'
+    hechos = 0
+    try:
+        coordinador = _conectar(host, puerto, clave)
+        while True:
+            tarea = coordinador.pedir(nombre)
+            if tarea == FIN:
+                break
+            if tarea is None:
+                time.sleep(espera)
+                continue
+            parar = threading.Event()
+            latidos = threading.Thread(target=_latir, daemon=True,
+                                       args=(host, puerto, clave, nombre, tarea['indice'], tarea['plazo'] / 3, parar))
+            latidos.start()
+            try:
+                parcial = ejecutar_shard(tarea)
+            except Exception:
+                # Avisar en vez de morir: si no, el plazo vence, lo toma otro trabajador y falla igual
+                coordinador.fallar(nombre, tarea['indice'], traceback.format_exc())
+                continue
+            finally:
+                parar.set()
+            coordinador.entregar(nombre, tarea['indice'], parcial)
+            hechos += 1
+    except (EOFError, ConnectionError):
+        pass  # El coordinador terminó
+    return hechos
+
+
+def ejecutar_distribuido(modulo, funcion, conjuntos, n_corridas, semilla, tam_shard=10, host='127.0.0.1',
+                         puerto=50000, clave=None, trabajadores_locales=0, plazo=60.0, intervalo=1.0):
+    """
+    Coordina la simulación de `n_corridas` de cada conjunto de parámetros.
+
+    Args:
+        modulo, funcion: Función `funcion(n_corridas, **parametros)` del módulo
+            (ver utilidades.carga) que devuelve un resumen de lote
+        conjuntos: Lista de (nombre, parametros)
+        n_corridas: Corridas por conjunto
+        semilla: Semilla de las subsecuencias por corrida
+        tam_shard: Corridas por shard
+        host, puerto: Dirección donde escucha el coordinador (puerto 0 = uno libre)
+        clave: Clave compartida con los trabajadores (None = una al azar, que se muestra al arrancar)
+        trabajadores_locales: Trabajadores a lanzar en esta máquina
+        plazo: Segundos sin latidos tras los que un shard se reasigna
+
+    Returns:
+        Diccionario {nombre: resumen fusionado}
+
+    Raises:
+        RuntimeError: Si un shard falló MAX_FALLOS veces
+    """
+    tareas = [{'modulo': modulo, 'funcion': funcion, 'parametros': parametros, 'semilla': semilla,
+               'conjunto': nombre, 'inicio': inicio, 'fin': min(inicio + tam_shard, n_corridas)}
+              for nombre, parametros in conjuntos
+              for inicio in range(0, n_corridas, tam_shard)]
+    coordinador = Coordinador(tareas, plazo)
+    _Gestor.register('coordinador', callable=lambda: coordinador)
+    if clave is None:
+        clave = secrets.token_hex(16)
+        print(f'Clave para los trabajadores: {clave}')
+    servidor = _Gestor(address=(host, puerto), authkey=clave.encode()).get_server()
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    host_real, puerto_real = servidor.address
+    print(f'Coordinador escuchando en {host_real}:{puerto_real} ({len(tareas)} shards)')
+
+    # Los trabajadores locales se lanzan con spawn: hacer fork con el servidor andando no es seguro
+    contexto = mp.get_context('spawn')
+    host_local = '127.0.0.1' if host in ('', '0.0.0.0') else host
+    locales = [contexto.Process(target=trabajar, args=(host_local, puerto_real, clave, f'local-{i}'), daemon=True)
+               for i in range(trabajadores_locales)]
+    for proceso in locales:
+        proceso.start()
+
+    inicio = time.perf_counter()
+    try:
+        while True:
+            hechos, total, activos, reasignadas = coordinador.estado()
+            sys.stdout.write(f'\rShards {hechos}/{total} | trabajadores activos: {activos} | '
+                             f'reasignados: {reasignadas} | {time.perf_counter() - inicio:.1f} s    ')
+            sys.stdout.flush()
+            if hechos == total:
+                break
+            error = coordinador.error()
+            if error is not None:
+                print()
+                raise RuntimeError(f'Se abortó la simulación distribuida. {error}')
+            time.sleep(intervalo)
+        print()
+        # Dar tiempo a que los trabajadores reciban FIN antes de cerrar el servidor
+        for proceso in locales:
+            proceso.join(timeout=5)
+    finally:
+        for proceso in locales:
+            if proceso.is_alive():
+                proceso.terminate()
+        servidor.stop_event.set()
+
+    # Fusionar en el orden de los shards: el resultado no depende de quién simuló cada uno
+    resultados = coordinador.resultados()
+    resumenes = {}
+    for indice, tarea in enumerate(tareas):
+        nombre = tarea['conjunto']
+        if nombre in resumenes:
+            fusionar_resumenes(resumenes[nombre], resultados[indice])
+        else:
+            resumenes[nombre] = resultados[indice]
+    return resumenes
+
+
+def mostrar_resumenes(resumenes, titulo):
+    """Imprime media ± semiancho del IC 95% de cada escalar, por conjunto de parámetros."""
+    print("\n" + "=" * 60)
+    print(titulo)
+    print("=" * 60)
+    for nombre, resumen in resumenes.items():
+        print(f"\n{nombre}")
+        for escalar, est in resumen['escalares'].items():
+            print(f"  {escalar:<25} {float(est.media):>14.6g} ± {float(est.semiancho_ic()):.3g}  ({est.n} corridas)")
+
+
+def agregar_argumentos(parser):
+    """Agrega los argumentos del modo coordinador a un parser de argparse."""
+    parser.add_argument('--distribuido', action='store_true',
+                        help='Reparte las corridas en shards entre trabajadores (ver utilidades/distribuido.py) (opcional)')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Dirección donde escucha el coordinador; 0.0.0.0 para aceptar otras máquinas (opcional, default=127.0.0.1)')
+    parser.add_argument('--puerto', type=int, default=50000,
+                        help='Puerto del coordinador (opcional, default=50000)')
+    parser.add_argument('--clave', default=None,
+                        help='Clave compartida entre coordinador y trabajadores (opcional, default=una al azar que se muestra al arrancar)')
+    parser.add_argument('--tam_shard', type=int, default=10,
+                        help='Corridas por shard (opcional, default=10)')
+    parser.add_argument('--trabajadores_locales', type=int, default=0,
+                        help='Trabajadores a lanzar en esta misma máquina (opcional, default=0)')
+    parser.add_argument('--plazo', type=float, default=60.0,
+                        help='Segundos sin noticias de un trabajador tras los que su shard se reasigna (opcional, default=60)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Trabajador de la ejecución distribuida')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+    trabajador = subparsers.add_parser('trabajador', help='Pide shards al coordinador y los simula')
+    trabajador.add_argument('--host', default='127.0.0.1', help='Dirección del coordinador (default=127.0.0.1)')
+    trabajador.add_argument('--puerto', type=int, default=50000, help='Puerto del coordinador (default=50000)')
+    trabajador.add_argument('--clave', required=True, help='Clave compartida con el coordinador (la muestra al arrancar si no se le pasó)')
+    args = parser.parse_args()
+
+    hechos = trabajar(args.host, args.puerto, args.clave)
+    print(f'Trabajador terminado: {hechos} shards simulados')
+
+
+if __name__ == '__main__':
+    main()
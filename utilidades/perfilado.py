@@ -0,0 +1,171 @@
+import json
+import time
+import cProfile
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class Perfilador:
+    """
+    Mide cuánto tiempo se va en cada fase de una simulación.
+
+    Se usa de dos formas:
+        - `with perfil.fase('graficado'):` para bloques grandes
+        - `perfil.marcar('resolucion')` dentro de los bucles calientes: suma a la
+          fase el tiempo transcurrido desde la marca anterior (como un cronómetro
+          de vueltas), así no hace falta un `with` por tirada.
+
+    Con memoria=True también se mide el pico de memoria con tracemalloc, que
+    hace varias veces más lento todo el código Python y cambia el reparto
+    entre fases: los tiempos de ese perfil no sirven para comparar.
+    """
+
+    def __init__(self, nombre, memoria=False, ruta_pstats=None):
+        self.nombre = nombre
+        self.memoria = memoria
+        self.ruta_pstats = ruta_pstats
+        self.fases = {}
+        self.contadores = {}
+        self.metricas = {}
+        self.pico_memoria = None
+        self._perfil_c = None
+        self._inicio = None
+        self._ultima_marca = None
+        self._duracion = None
+
+    def iniciar(self):
+        if self.memoria:
+            tracemalloc.start()
+        if self.ruta_pstats:
+            self._perfil_c = cProfile.Profile()
+            self._perfil_c.enable()
+        self._inicio = time.perf_counter()
+        self._ultima_marca = self._inicio
+        return self
+
+    def finalizar(self):
+        self._duracion = time.perf_counter() - self._inicio
+        if self._perfil_c is not None:
+            self._perfil_c.disable()
+            self._perfil_c.dump_stats(self.ruta_pstats)
+        if self.memoria:
+            _, self.pico_memoria = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    def reiniciar_marca(self):
+        """Arranca el cronómetro de vueltas sin sumar a ninguna fase."""
+        self._ultima_marca = time.perf_counter()
+
+    def marcar(self, fase):
+        ahora = time.perf_counter()
+        self.fases[fase] = self.fases.get(fase, 0.0) + (ahora - self._ultima_marca)
+        self._ultima_marca = ahora
+
+    @contextmanager
+    def fase(self, nombre, excluir_show=False):
+        """
+        Mide un bloque. Con excluir_show=True no cuenta el tiempo que plt.show()
+        queda bloqueado esperando que el usuario cierre la ventana.
+        """
+        bloqueado = [0.0]
+        if excluir_show:
+            import matplotlib.pyplot as plt
+            show_original = plt.show
+
+            def show_medido(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return show_original(*args, **kwargs)
+                finally:
+                    bloqueado[0] += time.perf_counter() - t0
+            plt.show = show_medido
+
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            transcurrido = time.perf_counter() - inicio - bloqueado[0]
+            self.fases[nombre] = self.fases.get(nombre, 0.0) + transcurrido
+            if excluir_show:
+                plt.show = show_original
+            self._ultima_marca = time.perf_counter()
+
+    def contar(self, clave, cantidad=1):
+        self.contadores[clave] = self.contadores.get(clave, 0) + cantidad
+
+    def reporte(self):
+        """Devuelve el reporte como diccionario (serializable a JSON)."""
+        total_fases = sum(self.fases.values())
+        return {
+            'nombre': self.nombre,
+            'duracion_total_seg': self._duracion,
+            'fases_seg': dict(self.fases),
+            'fases_porcentaje': {fase: (100 * t / total_fases if total_fases > 0 else 0.0)
+                                 for fase, t in self.fases.items()},
+            'contadores': dict(self.contadores),
+            'metricas': dict(self.metricas),
+            'pico_memoria_bytes': self.pico_memoria,
+            'tiempos_con_tracemalloc': self.memoria,
+            'pstats': self.ruta_pstats,
+        }
+
+    def resumen(self):
+        """Devuelve el reporte como texto para imprimir en consola."""
+        rep = self.reporte()
+        lineas = ['', '=' * 50, f'⏱️  Perfil de {self.nombre}', '=' * 50]
+        for fase, t in sorted(rep['fases_seg'].items(), key=lambda kv: -kv[1]):
+            lineas.append(f'{fase:<35} {t:>10.4f} s {rep["fases_porcentaje"][fase]:>6.1f}%')
+        lineas.append(f'{"total":<35} {rep["duracion_total_seg"]:>10.4f} s')
+        for clave, valor in rep['metricas'].items():
+            if isinstance(valor, dict):
+                for sub, v in valor.items():
+                    lineas.append(f'{clave}[{sub}]: {v:,.0f}')
+            else:
+                lineas.append(f'{clave}: {valor:,.2f}')
+        if rep['pico_memoria_bytes'] is not None:
+            lineas.append(f'Pico de memoria: {rep["pico_memoria_bytes"] / 2**20:.2f} MiB')
+            lineas.append('⚠️  Tiempos medidos con tracemalloc activo: están inflados (correr sin --profile_memoria para medirlos)')
+        if rep['pstats']:
+            lineas.append(f'Volcado de cProfile en {rep["pstats"]}')
+        return '\n'.join(lineas)
+
+    def guardar_json(self, ruta):
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(self.reporte(), f, indent=2, ensure_ascii=False)
+
+
+def agregar_argumentos(parser):
+    """Agrega --profile, --profile_memoria, --profile_json y --profile_pstats a un parser de argparse."""
+    parser.add_argument('--profile', action='store_true',
+                        help='Mide el tiempo de cada fase y tiradas/seg (opcional)')
+    parser.add_argument('--profile_memoria', action='store_true',
+                        help='Como --profile, pero además mide el pico de memoria con tracemalloc; '
+                             'los tiempos salen inflados (opcional)')
+    parser.add_argument('--profile_json', default='perfil.json',
+                        help='Archivo donde guardar el reporte JSON del perfil (default=perfil.json)')
+    parser.add_argument('--profile_pstats', default=None,
+                        help='Si se indica, guarda un volcado de cProfile/pstats en ese archivo (opcional)')
+
+
+def crear_perfilador(args, nombre):
+    """Devuelve un Perfilador ya iniciado si se pidió --profile o --profile_memoria, o None."""
+    if not (args.profile or args.profile_memoria):
+        return None
+    return Perfilador(nombre, memoria=args.profile_memoria, ruta_pstats=args.profile_pstats).iniciar()
+
+
+def medir_fase(perfil, nombre, excluir_show=False):
+    """Como perfil.fase(...), pero no hace nada si perfil es None."""
+    if perfil is None:
+        return nullcontext()
+    return perfil.fase(nombre, excluir_show=excluir_show)
+
+
+def cerrar_perfilador(perfil, args):
+    """Finaliza el perfil, imprime el resumen y guarda el JSON."""
+    if perfil is None:
+        return
+    perfil.finalizar()
+    print(perfil.resumen())
+    perfil.guardar_json(args.profile_json)
+    print(f'Reporte JSON guardado en {args.profile_json}')
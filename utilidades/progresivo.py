@@ -0,0 +1,273 @@
+import sys
+import time
+import queue
+import random
+import traceback
+import tracemalloc
+import multiprocessing as mp
+
+import numpy as np
+
+# Modo progresivo: la simulación corre en otro proceso y manda, después de cada
+# lote de corridas, un resumen parcial que se puede fusionar (conteos, medias y
+# sumas de cuadrados). Este proceso los va juntando y refresca la consola y los
+# gráficos a ritmo fijo, sin esperar a que termine la simulación.
+
+MAX_PUNTOS = 2000  # Puntos por curva al graficar (las curvas largas se submuestrean)
+
+
+class EstadisticaCorriente:
+    """
+    Media y varianza de un valor (o de un vector de valores, columna por
+    columna) que se van calculando de a lotes.
+
+    Dos estadísticas armadas por separado se fusionan con la fórmula de Chan
+    et al., así que da lo mismo cómo se partieron las corridas en lotes.
+    """
+
+    def __init__(self, forma=()):
+        self.n = 0
+        self.media = np.zeros(forma)
+        self.m2 = np.zeros(forma)  # Suma de cuadrados de las diferencias con la media
+
+    @classmethod
+    def desde(cls, valores):
+        """Arma la estadística de un lote: valores es (n,) o (n, n_columnas)."""
+        valores = np.asarray(valores, dtype=np.float64)
+        est = cls(valores.shape[1:])
+        est.n = len(valores)
+        if est.n:
+            est.media = valores.mean(axis=0)
+            est.m2 = ((valores - est.media) ** 2).sum(axis=0)
+        return est
+
+    def fusionar(self, otro):
+        if otro.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.media, self.m2 = otro.n, otro.media.copy(), otro.m2.copy()
+            return self
+        n = self.n + otro.n
+        delta = otro.media - self.media
+        self.media = self.media + delta * (otro.n / n)
+        self.m2 = self.m2 + otro.m2 + delta ** 2 * (self.n * otro.n / n)
+        self.n = n
+        return self
+
+    def varianza(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else np.full_like(self.media, np.nan)
+
+    def desvio(self):
+        return np.sqrt(self.varianza())
+
+    def semiancho_ic(self, z=1.96):
+        """Semiancho del intervalo de confianza de la media (aproximación normal)."""
+        return z * np.sqrt(self.varianza() / self.n) if self.n > 1 else np.full_like(self.media, np.nan)
+
+
+def resumen_lote(escalares, curvas):
+    """
+    Arma el resumen parcial de un lote de corridas.
+
+    Args:
+        escalares: {nombre: valores} con un valor por corrida (ej: ganancia neta)
+        curvas: {nombre: matriz (corridas, tiradas)} con un valor por tirada
+    """
+    return {
+        'escalares': {nombre: EstadisticaCorriente.desde(v) for nombre, v in escalares.items()},
+        'curvas': {nombre: EstadisticaCorriente.desde(v) for nombre, v in curvas.items()},
+    }
+
+
+def fusionar_resumenes(total, parcial):
+    """Incorpora el resumen `parcial` a `total` (ambos de resumen_lote) y devuelve `total`."""
+    for grupo in ('escalares', 'curvas'):
+        propios = total[grupo]
+        for nombre, est in parcial[grupo].items():
+            if nombre in propios:
+                propios[nombre].fusionar(est)
+            else:
+                propios[nombre] = est
+    return total
+
+
+def _trabajador(cola, modulo, funcion, parametros, n_corridas, estado_random, segundos_lote):
+    """
+    Proceso de simulación: corre lotes de corridas y publica cada resumen.
+
+    El primer lote es de una sola corrida (así el primer resultado llega
+    enseguida); después el tamaño se ajusta para que cada lote dure unos
+    `segundos_lote`. Como random sigue la misma secuencia, las corridas son
+    las mismas que sin modo progresivo, sea cual sea el tamaño de los lotes.
+    """
+    if tracemalloc.is_tracing():
+        # Heredado del perfilador del proceso principal (fork): acá solo frenaría la simulación
+        tracemalloc.stop()
+    try:
+        from utilidades.carga import cargar_modulo
+        resumir = getattr(cargar_modulo(modulo), funcion)
+        random.setstate(estado_random)
+        hechas, lote = 0, 1
+        while hechas < n_corridas:
+            lote = min(lote, n_corridas - hechas)
+            inicio = time.perf_counter()
+            parcial = resumir(lote, **parametros)
+            duracion = time.perf_counter() - inicio
+            hechas += lote
+            cola.put(('lote', hechas, parcial))
+            # Crecer de a poco: la primera corrida puede no ser representativa
+            lote = max(1, min(4 * lote, int(lote * segundos_lote / max(duracion, 1e-6))))
+        cola.put(('fin', hechas, None))
+    except Exception:
+        cola.put(('error', 0, traceback.format_exc()))
+
+
+class VistaProgresiva:
+    """
+    Junta los resúmenes parciales y muestra el estado de la simulación: una
+    línea de consola (media ± semiancho del IC 95% de cada escalar y tiempo
+    restante estimado) y una figura con la media de cada curva, su IC 95% y
+    la banda de ±1 desvío entre corridas.
+    """
+
+    def __init__(self, titulo, n_corridas, referencias=None, graficar=True):
+        self.titulo = titulo
+        self.n_corridas = n_corridas
+        self.referencias = referencias or {}
+        self.graficar = graficar
+        self.hechas = 0
+        self.escalares = {}
+        self.curvas = {}
+        self.historia = []  # (corridas, media, semiancho) del primer escalar, para ver cómo converge
+        self._fig = None
+
+    def incorporar(self, hechas, parcial):
+        self.hechas = hechas
+        fusionar_resumenes({'escalares': self.escalares, 'curvas': self.curvas}, parcial)
+        if self.escalares:
+            est = next(iter(self.escalares.values()))
+            self.historia.append((self.hechas, float(est.media), float(est.semiancho_ic())))
+
+    def linea(self, transcurrido):
+        """Resumen de una línea para la consola."""
+        partes = [f'{self.hechas}/{self.n_corridas} corridas ({100 * self.hechas / self.n_corridas:.0f}%)']
+        for nombre, est in self.escalares.items():
+            partes.append(f'{nombre}: {float(est.media):.4g} ± {float(est.semiancho_ic()):.2g}')
+        if 0 < self.hechas < self.n_corridas:
+            restante = transcurrido / self.hechas * (self.n_corridas - self.hechas)
+            partes.append(f'ETA {restante:.0f} s')
+        else:
+            partes.append(f'{transcurrido:.1f} s')
+        return ' | '.join(partes)
+
+    def refrescar(self, transcurrido):
+        sys.stdout.write('\r' + self.linea(transcurrido) + ' ' * 4)
+        sys.stdout.flush()
+        if self.graficar and self.hechas:
+            self._dibujar()
+
+    def _dibujar(self):
+        import matplotlib.pyplot as plt
+
+        paneles = len(self.curvas) + (1 if self.historia else 0)
+        if self._fig is None:
+            plt.ion()
+            self._fig, axs = plt.subplots(paneles, 1, figsize=(10, 3.5 * paneles), squeeze=False)
+            self._axs = axs[:, 0]
+        for ax, (nombre, est) in zip(self._axs, self.curvas.items()):
+            ax.clear()
+            paso = max(1, len(est.media) // MAX_PUNTOS)
+            x = np.arange(1, len(est.media) + 1)[::paso]
+            media = est.media[::paso]
+            desvio = est.desvio()[::paso]
+            semiancho = est.semiancho_ic()[::paso]
+            ax.fill_between(x, media - desvio, media + desvio, alpha=0.15, label='±1 desvío entre corridas')
+            ax.fill_between(x, media - semiancho, media + semiancho, alpha=0.4, label='IC 95% de la media')
+            ax.plot(x, media, linewidth=1.5, label='Media')
+            if nombre in self.referencias:
+                ax.axhline(y=self.referencias[nombre], color='r', linestyle='--', label='Teórico')
+            ax.set_title(f'{nombre} ({est.n} corridas)')
+            ax.set_xlabel('Número de tiradas')
+            ax.legend(loc='best', fontsize='small')
+            ax.grid(True)
+        if self.historia:
+            ax = self._axs[-1]
+            ax.clear()
+            corridas, medias, semianchos = (np.array(v) for v in zip(*self.historia))
+            ax.fill_between(corridas, medias - semianchos, medias + semianchos, alpha=0.3, label='IC 95%')
+            ax.plot(corridas, medias, marker='.', label='Media')
+            ax.set_title(f'Convergencia de {next(iter(self.escalares))}')
+            ax.set_xlabel('Corridas terminadas')
+            ax.legend(loc='best', fontsize='small')
+            ax.grid(True)
+        self._fig.suptitle(f'{self.titulo} - {self.hechas}/{self.n_corridas} corridas')
+        self._fig.tight_layout()
+        self._fig.canvas.draw_idle()
+
+    def esperar(self, segundos):
+        if self.graficar and self._fig is not None:
+            import matplotlib.pyplot as plt
+            plt.pause(segundos)  # Mantiene la ventana viva mientras se espera
+        else:
+            time.sleep(segundos)
+
+    def finalizar(self, transcurrido):
+        self.refrescar(transcurrido)
+        print()
+        if self.graficar and self._fig is not None:
+            import matplotlib.pyplot as plt
+            plt.ioff()
+            plt.show()
+
+
+def ejecutar_progresivo(modulo, funcion, parametros, n_corridas, vista, intervalo=1.0):
+    """
+    Corre `funcion(n_corridas_lote, **parametros)` del módulo `modulo` (ver
+    utilidades.carga) en otro proceso, de a lotes, y va mostrando los
+    resúmenes en `vista` cada `intervalo` segundos.
+
+    La función tiene que devolver un resumen de lote (ver resumen_lote). El
+    proceso arranca con el estado actual de random, así que los resultados
+    coinciden con los de una corrida normal con la misma semilla.
+    """
+    cola = mp.Queue()
+    proceso = mp.Process(target=_trabajador, daemon=True,
+                         args=(cola, modulo, funcion, parametros, n_corridas, random.getstate(), intervalo))
+    inicio = time.perf_counter()
+    proceso.start()
+    try:
+        terminado = False
+        while not terminado:
+            nuevos = False
+            try:
+                while True:
+                    tipo, hechas, dato = cola.get_nowait()
+                    if tipo == 'error':
+                        raise RuntimeError(f'Falló la simulación en el proceso de trabajo:\n{dato}')
+                    if tipo == 'fin':
+                        terminado = True
+                        break
+                    vista.incorporar(hechas, dato)
+                    nuevos = True
+            except queue.Empty:
+                if not proceso.is_alive() and cola.empty():
+                    raise RuntimeError('El proceso de simulación terminó sin avisar')
+            if terminado:
+                break
+            if nuevos:
+                vista.refrescar(time.perf_counter() - inicio)
+            vista.esperar(intervalo)
+        vista.finalizar(time.perf_counter() - inicio)
+    finally:
+        if proceso.is_alive():
+            proceso.terminate()
+        proceso.join()
+    return vista
+
+
+def agregar_argumentos(parser):
+    """Agrega --progresivo e --intervalo a un parser de argparse."""
+    parser.add_argument('--progresivo', action='store_true',
+                        help='Muestra resultados parciales (media, IC 95%% y tiempo restante) mientras la simulación corre (opcional)')
+    parser.add_argument('--intervalo', type=float, default=1.0,
+                        help='Segundos entre actualizaciones en modo progresivo (opcional, default=1.0)')